@@ -11,26 +11,68 @@
 """
 
 import fitz  # PyMuPDF
-from PIL import Image, ImageDraw
 import cv2
 import numpy as np
 import json
 import os
-import base64
+import html
 import io
 import shutil
+import functools
+import tempfile
+from string import Template
+import ctypes
+import ctypes.util
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from pathlib import Path
 from datetime import datetime
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import threading
 import webbrowser
 import urllib.parse
 
+# JSON処理（orjsonがあればC実装の高速版を使用）
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# 傾き検出（Leptonicaの共有ライブラリがあればctypes経由で使用）
+def _load_leptonica():
+    """Leptonicaを読み込み、使用する関数の型を設定（見つからなければNone）"""
+    name = ctypes.util.find_library("lept") or ctypes.util.find_library("leptonica")
+    if not name:
+        return None
+    try:
+        lib = ctypes.CDLL(name)
+    except OSError:
+        return None
+
+    lib.pixCreate.restype = ctypes.c_void_p
+    lib.pixCreate.argtypes = [ctypes.c_int32, ctypes.c_int32, ctypes.c_int32]
+    lib.pixGetData.restype = ctypes.c_void_p
+    lib.pixGetData.argtypes = [ctypes.c_void_p]
+    lib.pixGetWpl.restype = ctypes.c_int32
+    lib.pixGetWpl.argtypes = [ctypes.c_void_p]
+    lib.pixFindSkew.restype = ctypes.c_int32
+    lib.pixFindSkew.argtypes = [
+        ctypes.c_void_p, ctypes.POINTER(ctypes.c_float), ctypes.POINTER(ctypes.c_float)
+    ]
+    lib.pixDestroy.restype = None
+    lib.pixDestroy.argtypes = [ctypes.POINTER(ctypes.c_void_p)]
+    return lib
+
+
+LEPTONICA = _load_leptonica()
+HAS_LEPTONICA = LEPTONICA is not None
+
 # verify_survey.pyから必要な関数をインポート
 from verify_survey import (
     pdf_to_image, ImageDeskewer, detect_paper_region,
-    calculate_crop_regions_simple, crop_regions, save_cropped_images,
-    image_to_base64, QUESTION_ORDER, QUESTION_LABELS
+    calculate_crop_regions_simple, crop_regions,
+    QUESTION_ORDER, QUESTION_LABELS
 )
 
 # 設定
@@ -39,7 +81,150 @@ SCAN_DATA_DIR = BASE_DIR / "Scan Data"
 CHECKED_DATA_DIR = BASE_DIR / "Checked Data"
 OUTPUT_DIR = BASE_DIR / "cropped_images"
 BATCH_DATA_DIR = OUTPUT_DIR / "batch_data"
+MANIFEST_PATH = BATCH_DATA_DIR / "manifest.json"
+HTML_TEMPLATE_PATH = BASE_DIR / "templates" / "batch_verification.html"
+# PDFごとの処理結果キャッシュ（batch_data/{folder}/ 内）
+RESULT_CACHE_NAME = "cache.json"
+FALLBACK_OCR_PATH = BASE_DIR / "survey_result.json"
+# 確認済みJSONと一緒に保存するスキャン画像のフォルダ名（Scan Data/ 内）
+SCAN_SIDECAR_DIRNAME = "scans"
 SERVER_PORT = 8765
+# POSTボディを読み込む単位(bytes)
+POST_READ_CHUNK_SIZE = 64 * 1024
+# 保存処理の完了を待つ最大時間(秒)。超えた場合は書き込みを継続したまま202を返す
+SAVE_WAIT_TIMEOUT = 5.0
+# batch_data配下の画像に付けるブラウザキャッシュ期間(秒)
+# 画像URLには ?v=更新時刻 を付けるため、再生成時は別URLとして再取得される
+ASSET_CACHE_MAX_AGE = 31536000
+
+# Leptonicaの傾き検出結果を採用する最小信頼度（pixDeskewの既定値と同じ）
+LEPT_MIN_CONFIDENCE = 3.0
+# これ未満の傾き(度)は補正しない
+LEPT_MIN_ANGLE = 0.1
+
+# 事前処理の並列ワーカー数
+# 各ワーカーが300DPIのページ画像（補正前後で約100MB）を保持するため、
+# CPUコア数に加えてメモリ量でも上限を設ける
+MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+# 起動前に処理しておくファイル数。残りは照合中に先読みで処理する
+PREFETCH_EAGER_COUNT = MAX_WORKERS
+# 照合中のファイルから何件先まで先読みするか
+PREFETCH_DEPTH = 3
+
+# 全体スキャン画像のJPEG品質（照合表示用のため非可逆で十分）
+SCAN_JPEG_QUALITY = 85
+# 全体スキャン画像の長辺の上限(px)。ブラウザ表示には300DPIの原寸は不要
+SCAN_PREVIEW_MAX_SIDE = 1600
+# 切り出し画像をまとめたシート画像のJPEG品質（文字の判読用にやや高め）
+SHEET_JPEG_QUALITY = 90
+
+
+def json_loads(data):
+    """JSON文字列/バイト列をパース"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_default(obj):
+    """JSONの標準型以外の変換（傾き角度などに混ざるNumPyのスカラー・配列）"""
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def json_dumps(obj, indent=False):
+    """
+    オブジェクトをUTF-8のJSONバイト列に変換
+
+    Args:
+        indent: Trueなら2スペースインデント、Falseなら最小表現
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_json_default, option=option)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2,
+                          default=_json_default).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'),
+                      default=_json_default).encode('utf-8')
+
+
+# 確認済みJSON書き込み用のスレッドプール（リクエスト処理スレッドからディスク書き込みを切り離す）
+SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+
+def write_json_atomic(save_path, json_data, indent=True):
+    """
+    JSONを一時ファイルに書き出してから置き換える
+
+    書き込み途中で中断されても、保存先に不完全なファイルが残らない。
+
+    Args:
+        indent: Falseなら最小表現で書き出す（json_dumps と同じ）
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=save_path.parent,
+                                    prefix=save_path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(json_dumps(json_data, indent=indent))
+        os.replace(tmp_path, save_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return save_path
+
+
+def write_verified_files(save_path, json_data, scan_src=None, scan_dst=None):
+    """確認済みJSONを保存（スキャン画像があれば先にコピー）"""
+    if scan_src is not None:
+        os.makedirs(scan_dst.parent, exist_ok=True)
+        shutil.copyfile(scan_src, scan_dst)
+    return write_json_atomic(save_path, json_data)
+
+
+def _log_save_result(future, save_path):
+    """保存完了/失敗をサーバーログに出力"""
+    error = future.exception()
+    if error is None:
+        print(f"    [保存完了] {save_path}")
+    else:
+        print(f"    [保存エラー] {save_path}: {error}")
+
+
+def submit_save(item):
+    """
+    保存リクエスト1件分の書き込みをスレッドプールに投入
+
+    Args:
+        item: {"filename": 保存ファイル名, "data": 確認済みJSON, "scan_image": 画像パス}
+
+    Returns:
+        tuple: (保存先パス, Future)
+    """
+    filename = item.get('filename', 'unknown_verified.json')
+    json_data = item.get('data', {})
+    save_path = SCAN_DATA_DIR / filename
+
+    # スキャン画像はBase64で埋め込まず、JSONと同じ場所に画像ファイルとして保存し
+    # JSONにはその相対パスのみ記録
+    scan_src = scan_dst = None
+    scan_image = item.get('scan_image')
+    if scan_image:
+        scan_src = resolve_scan_image(scan_image)
+        scan_rel = f"{SCAN_SIDECAR_DIRNAME}/{save_path.stem}{scan_src.suffix}"
+        scan_dst = SCAN_DATA_DIR / scan_rel
+        json_data["スキャン画像パス"] = scan_rel
+
+    # Scan Dataフォルダに保存
+    future = SAVE_EXECUTOR.submit(write_verified_files, save_path, json_data,
+                                  scan_src, scan_dst)
+    future.add_done_callback(lambda f: _log_save_result(f, save_path))
+    return save_path, future
 
 
 class VerificationHandler(SimpleHTTPRequestHandler):
@@ -47,53 +232,171 @@ class VerificationHandler(SimpleHTTPRequestHandler):
     照合用HTTPハンドラ
     - GET: 静的ファイル配信
     - POST /save: JSON保存
+    - POST /save_batch: 複数ファイルのJSONを一括保存
+    - GET /nextfile?index=N: 未処理ファイルの処理を待ってマニフェスト要素を返す
     """
 
+    # 照合中の先読み処理（main で設定）
+    prefetch = None
+
+    # レスポンス書き込みをバッファリング（リクエスト終了時にまとめて送信）
+    wbufsize = -1
+
+    # 拡張子 → Content-Type のキャッシュ（全スレッドで共有）
+    _type_cache = {}
+
     def __init__(self, *args, **kwargs):
         # カレントディレクトリをcropped_imagesに設定
         super().__init__(*args, directory=str(OUTPUT_DIR), **kwargs)
 
+    def do_GET(self):
+        """GETリクエストを処理（/nextfile 以外は静的ファイル配信）"""
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != '/nextfile':
+            super().do_GET()
+            return
+
+        try:
+            query = urllib.parse.parse_qs(url.query)
+            index = int(query['index'][0])
+            if self.prefetch is None:
+                raise LookupError("先読み処理が開始されていません")
+
+            result = self.prefetch.get(index)
+            if result["status"] == "success":
+                self.send_json(200, _manifest_entry(result))
+            else:
+                self.send_json(500, {'status': 'error',
+                                     'message': result.get('error', '不明なエラー')})
+        except Exception as e:
+            self.send_json(400, {'status': 'error', 'message': str(e)})
+
     def do_POST(self):
         """POSTリクエストを処理（JSON保存）"""
         if self.path == '/save':
             try:
                 # リクエストボディを読み取り
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                data = json.loads(post_data.decode('utf-8'))
-
-                # 保存先パスを取得
-                filename = data.get('filename', 'unknown_verified.json')
-                json_data = data.get('data', {})
+                data = json_loads(self.read_body())
+
+                save_path, future = submit_save(data)
+                try:
+                    future.result(timeout=SAVE_WAIT_TIMEOUT)
+                except FuturesTimeoutError:
+                    # 書き込みは継続中（結果はサーバーログに出力）
+                    self.send_json(202, {'status': 'accepted', 'path': str(save_path)})
+                else:
+                    # 成功レスポンス
+                    self.send_json(200, {'status': 'success', 'path': str(save_path)})
 
-                # Scan Dataフォルダに保存
-                save_path = SCAN_DATA_DIR / filename
-
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    json.dump(json_data, f, ensure_ascii=False, indent=2)
-
-                print(f"    [保存完了] {save_path}")
+            except Exception as e:
+                print(f"    [保存エラー] {e}")
+                self.send_json(500, {'status': 'error', 'message': str(e)})
 
-                # 成功レスポンス
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response = {'status': 'success', 'path': str(save_path)}
-                self.wfile.write(json.dumps(response).encode('utf-8'))
+        elif self.path == '/save_batch':
+            try:
+                data = json_loads(self.read_body())
+
+                # 全ファイルの書き込みを先に投入し、まとめて完了を待つ
+                submitted = []
+                for item in data.get('files', []):
+                    try:
+                        submitted.append(submit_save(item))
+                    except Exception as e:
+                        print(f"    [保存エラー] {e}")
+                        submitted.append((None, e))
+
+                results = []
+                for save_path, future in submitted:
+                    if save_path is None:
+                        results.append({'status': 'error', 'message': str(future)})
+                        continue
+                    try:
+                        future.result(timeout=SAVE_WAIT_TIMEOUT)
+                        results.append({'status': 'success', 'path': str(save_path)})
+                    except FuturesTimeoutError:
+                        results.append({'status': 'accepted', 'path': str(save_path)})
+                    except Exception as e:
+                        results.append({'status': 'error', 'path': str(save_path),
+                                        'message': str(e)})
+
+                has_error = any(r['status'] == 'error' for r in results)
+                self.send_json(200, {'status': 'partial' if has_error else 'success',
+                                     'results': results})
 
             except Exception as e:
                 print(f"    [保存エラー] {e}")
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response = {'status': 'error', 'message': str(e)}
-                self.wfile.write(json.dumps(response).encode('utf-8'))
+                self.send_json(500, {'status': 'error', 'message': str(e)})
         else:
             self.send_response(404)
             self.end_headers()
 
+    def send_json(self, code, response):
+        """JSONレスポンスを送信"""
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps(response).encode('utf-8'))
+
+    def read_body(self):
+        """リクエストボディをチャンク単位で読み取る"""
+        remaining = int(self.headers['Content-Length'])
+        chunks = []
+        while remaining > 0:
+            chunk = self.rfile.read(min(POST_READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise ConnectionError("リクエストボディが途中で切断されました")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def send_response(self, code, message=None):
+        self._status_code = code
+        super().send_response(code, message)
+
+    def end_headers(self):
+        """batch_data配下の画像には長期キャッシュ用のヘッダーを付与"""
+        if self.command == 'GET' and getattr(self, '_status_code', None) == 200:
+            path = urllib.parse.urlsplit(self.path).path
+            if path.startswith('/batch_data/') and not path.endswith('.json'):
+                self.send_header('Cache-Control', f'public, max-age={ASSET_CACHE_MAX_AGE}')
+        super().end_headers()
+
+    def guess_type(self, path):
+        """Content-Typeの判定結果を拡張子ごとにキャッシュ"""
+        ext = os.path.splitext(path)[1].lower()
+        ctype = self._type_cache.get(ext)
+        if ctype is None:
+            ctype = super().guess_type(path)
+            self._type_cache[ext] = ctype
+        return ctype
+
+    def copyfile(self, source, outputfile):
+        """
+        静的ファイルを送信
+
+        POSIX環境では os.sendfile でカーネル内コピーし、Pythonを経由させない。
+        Windowsなど非対応環境では標準の実装を使う。
+        """
+        if not hasattr(os, 'sendfile'):
+            return super().copyfile(source, outputfile)
+
+        try:
+            in_fd = source.fileno()
+            size = os.fstat(in_fd).st_size
+        except (AttributeError, OSError):
+            return super().copyfile(source, outputfile)
+
+        # バッファ済みのヘッダーを先に送る
+        outputfile.flush()
+        out_fd = self.connection.fileno()
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
     def do_OPTIONS(self):
         """CORSプリフライトリクエスト対応"""
         self.send_response(200)
@@ -108,9 +411,25 @@ class VerificationHandler(SimpleHTTPRequestHandler):
             print(f"    [HTTP] {args[0]}")
 
 
+def resolve_scan_image(scan_image):
+    """
+    batch_data配下のスキャン画像の実パスを返す
+
+    Args:
+        scan_image: OUTPUT_DIRからの相対パス
+    """
+    scan_path = (OUTPUT_DIR / scan_image).resolve()
+    if BATCH_DATA_DIR.resolve() not in scan_path.parents:
+        raise ValueError(f"不正な画像パス: {scan_image}")
+    if not scan_path.is_file():
+        raise FileNotFoundError(f"スキャン画像がありません: {scan_image}")
+    return scan_path
+
+
 def start_server():
     """ローカルHTTPサーバーを起動"""
-    server = HTTPServer(('localhost', SERVER_PORT), VerificationHandler)
+    # 保存中も画像などの静的ファイル配信を止めないようスレッドで並行処理
+    server = ThreadingHTTPServer(('localhost', SERVER_PORT), VerificationHandler)
     print(f"\n[サーバー起動] http://localhost:{SERVER_PORT}/")
     server.serve_forever()
 
@@ -121,12 +440,32 @@ def get_pdf_files():
         os.makedirs(SCAN_DATA_DIR, exist_ok=True)
         return []
 
-    pdf_files = set()
-    for pattern in ["*.pdf", "*.PDF"]:
-        for f in SCAN_DATA_DIR.glob(pattern):
-            pdf_files.add(f)
+    # 1回のディレクトリ走査で拡張子の大文字・小文字を問わず取得
+    with os.scandir(SCAN_DATA_DIR) as entries:
+        pdf_files = [
+            Path(entry.path) for entry in entries
+            if entry.name.lower().endswith('.pdf') and entry.is_file()
+        ]
+
+    return sorted(pdf_files, key=lambda x: x.name.lower())
+
 
-    return sorted(list(pdf_files), key=lambda x: x.name.lower())
+@functools.lru_cache(maxsize=None)
+def _load_json_cached(path_str, mtime):
+    """
+    JSONファイルを読み込む（パス+更新時刻でキャッシュ）
+
+    mtimeはキャッシュキーとしてのみ使用し、ファイル更新時は再読み込みされる。
+    戻り値は共有されるため、呼び出し側で変更しないこと。
+    """
+    with open(path_str, 'rb') as f:
+        return json_loads(f.read())
+
+
+def _load_json(path):
+    """_load_json_cached の呼び出しラッパー"""
+    resolved = path.resolve()
+    return _load_json_cached(str(resolved), resolved.stat().st_mtime)
 
 
 def load_ocr_result(pdf_path):
@@ -145,21 +484,18 @@ def load_ocr_result(pdf_path):
 
     if json_path.exists():
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                print(f"    OCR結果読み込み: {json_path.name}")
-                return data
+            data = _load_json(json_path)
+            print(f"    OCR結果読み込み: {json_path.name}")
+            return data
         except Exception as e:
             print(f"    JSON読み込みエラー: {e}")
 
-    # フォールバック: survey_result.json
-    fallback_path = BASE_DIR / "survey_result.json"
-    if fallback_path.exists():
+    # フォールバック: survey_result.json（複数PDFで共有されるため1回だけパース）
+    if FALLBACK_OCR_PATH.exists():
         try:
-            with open(fallback_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                print(f"    OCR結果読み込み（フォールバック）: survey_result.json")
-                return data
+            data = _load_json(FALLBACK_OCR_PATH)
+            print(f"    OCR結果読み込み（フォールバック）: survey_result.json")
+            return data
         except Exception as e:
             print(f"    JSON読み込みエラー: {e}")
 
@@ -167,6 +503,50 @@ def load_ocr_result(pdf_path):
     return {}
 
 
+def _format_drinking(value):
+    """質問13_飲酒習慣"""
+    lines = [f"選択: {value.get('選択', '')}"]
+    if value.get('回答1'):
+        r1 = value['回答1']
+        lines.append(f"回答1: {r1.get('酒類', '')} 週{r1.get('頻度', '')} {r1.get('サイズ', '')} {r1.get('数量', '')}杯")
+    return "\n".join(lines)
+
+
+def _format_default(value):
+    """その他のdict"""
+    return json.dumps(value, ensure_ascii=False)
+
+
+# 判別キーの組 → 整形関数（複数該当時は定義順で優先）
+_FORMATTERS = {
+    # 質問1_名前
+    frozenset({"氏", "名"}): lambda v: f"氏: {v.get('氏', '')} / 名: {v.get('名', '')}",
+    # 質問2_生年月日
+    frozenset({"年号"}): lambda v: f"{v.get('年号', '')} {v.get('年', '')}年{v.get('月', '')}月{v.get('日', '')}日",
+    # 質問5_身体情報
+    frozenset({"身長_cm"}): lambda v: f"身長: {v.get('身長_cm', '')}cm / 体重: {v.get('体重_kg', '')}kg",
+    # 選択式質問
+    frozenset({"回答"}): lambda v: v.get("回答", ""),
+    # 質問13_飲酒習慣
+    frozenset({"選択"}): _format_drinking,
+    # 質問14_歯の抜去位置
+    frozenset({"左右"}): lambda v: f"{v.get('左右', '')} / {v.get('上下', '')} / 番号: {v.get('番号', '')}",
+    # 質問15_コメント
+    frozenset({"内容"}): lambda v: v.get("内容", ""),
+}
+_DISCRIMINATORS = frozenset().union(*_FORMATTERS)
+
+
+def _select_formatter(value):
+    """dictのキー構成から整形関数を選ぶ"""
+    hits = _DISCRIMINATORS.intersection(value)
+    formatter = _FORMATTERS.get(hits)
+    if formatter is None and hits:
+        # 判別キーが複数含まれる場合
+        formatter = next((f for keys, f in _FORMATTERS.items() if keys <= hits), None)
+    return formatter or _format_default
+
+
 def format_ocr_value(key, value):
     """
     OCR結果の値を表示用文字列に変換
@@ -182,42 +562,147 @@ def format_ocr_value(key, value):
         if key == "患者さんID":
             return value.get("値", "")
 
-        if "氏" in value and "名" in value:
-            # 質問1_名前
-            return f"氏: {value.get('氏', '')} / 名: {value.get('名', '')}"
+        return _select_formatter(value)(value)
 
-        if "年号" in value:
-            # 質問2_生年月日
-            return f"{value.get('年号', '')} {value.get('年', '')}年{value.get('月', '')}月{value.get('日', '')}日"
+    return str(value)
 
-        if "身長_cm" in value:
-            # 質問5_身体情報
-            return f"身長: {value.get('身長_cm', '')}cm / 体重: {value.get('体重_kg', '')}kg"
 
-        if "回答" in value:
-            # 選択式質問
-            return value.get("回答", "")
+def extract_ocr_results(ocr_data):
+    """
+    OCR結果JSONから照合画面用の表示文字列を取り出す
 
-        if "選択" in value:
-            # 質問13_飲酒習慣
-            lines = [f"選択: {value.get('選択', '')}"]
-            if value.get('回答1'):
-                r1 = value['回答1']
-                lines.append(f"回答1: {r1.get('酒類', '')} 週{r1.get('頻度', '')} {r1.get('サイズ', '')} {r1.get('数量', '')}杯")
-            return "\n".join(lines)
+    Returns:
+        dict: {項目名: 表示用文字列}
+    """
+    results = {}
+    if not ocr_data:
+        return results
 
-        if "左右" in value:
-            # 質問14_歯の抜去位置
-            return f"{value.get('左右', '')} / {value.get('上下', '')} / 番号: {value.get('番号', '')}"
+    # 医療機関名
+    institution = ocr_data.get("医療機関名")
+    if institution is not None:
+        results["医療機関名"] = institution
 
-        if "内容" in value:
-            # 質問15_コメント
-            return value.get("内容", "")
+    # 患者さんID
+    patient_id = ocr_data.get("患者さんID")
+    if patient_id is not None:
+        results["患者さんID"] = format_ocr_value("患者さんID", patient_id)
 
-        # その他のdict
-        return json.dumps(value, ensure_ascii=False)
+    # 回答データ
+    answers = ocr_data.get("回答データ")
+    if answers:
+        results.update(
+            (key, format_ocr_value(key, value)) for key, value in answers.items()
+        )
 
-    return str(value)
+    return results
+
+
+def deskew_leptonica(image):
+    """
+    Leptonica (pixFindSkew) で傾きを検出し、OpenCVで回転補正
+
+    Args:
+        image: BGR画像
+
+    Returns:
+        tuple: (補正後画像, 傾斜角度) / 検出の信頼度が低い場合はNone
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    # 1bpp画像（1=黒）に変換し、Leptonicaの32bitワード単位（左端がMSB）に詰める
+    _, binary = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    h, w = binary.shape
+    wpl = (w + 31) // 32
+    packed = np.zeros((h, wpl * 4), dtype=np.uint8)
+    packed[:, :(w + 7) // 8] = np.packbits(binary, axis=1)
+    words = np.ascontiguousarray(packed.view(">u4").astype(np.uint32))
+
+    lib = LEPTONICA
+    pix = ctypes.c_void_p(lib.pixCreate(w, h, 1))
+    if not pix.value:
+        return None
+    try:
+        if lib.pixGetWpl(pix) != wpl:
+            return None
+        ctypes.memmove(lib.pixGetData(pix), words.ctypes.data, words.nbytes)
+
+        angle = ctypes.c_float(0.0)
+        conf = ctypes.c_float(0.0)
+        if lib.pixFindSkew(pix, ctypes.byref(angle), ctypes.byref(conf)) != 0:
+            return None
+    finally:
+        lib.pixDestroy(ctypes.byref(pix))
+
+    if conf.value < LEPT_MIN_CONFIDENCE:
+        return None
+    skew_angle = round(float(angle.value), 2)
+    if abs(skew_angle) < LEPT_MIN_ANGLE:
+        return image, 0.0
+
+    # Leptonicaは時計回りが正、OpenCVは反時計回りが正
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), -skew_angle, 1.0)
+    corrected = cv2.warpAffine(
+        image, matrix, (w, h),
+        flags=cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_CONSTANT,
+        borderValue=(255, 255, 255),
+    )
+    return corrected, skew_angle
+
+
+def encode_jpeg(image, quality=SCAN_JPEG_QUALITY):
+    """
+    OpenCV画像(BGR)をJPEGにエンコード
+
+    Returns:
+        bytes: JPEGデータ
+    """
+    ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEGエンコードに失敗しました")
+    return buffer.tobytes()
+
+
+def make_scan_preview(image, max_side=SCAN_PREVIEW_MAX_SIDE):
+    """表示用に長辺を max_side 以下へ縮小（拡大はしない）"""
+    h, w = image.shape[:2]
+    scale = min(1.0, max_side / max(h, w))
+    if scale >= 1.0:
+        return image
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+
+def build_sprite_sheet(cropped_images):
+    """
+    切り出し画像を縦に連結して1枚のシート画像にまとめる
+
+    幅は最大幅に右側を白で埋めて揃え、各画像の高さは8px単位に切り上げる
+    （JPEGの8x8ブロックが隣の画像にまたがらないようにするため）
+
+    Returns:
+        tuple: (シート画像, {領域名: {"y", "width", "height"}})
+    """
+    items = [(name, img) for name, img in cropped_images.items()
+             if img is not None and img.size > 0]
+    if not items:
+        raise ValueError("切り出し画像がありません")
+
+    sheet_width = max(img.shape[1] for _, img in items)
+
+    tiles = []
+    layout = {}
+    y = 0
+    for name, img in items:
+        if img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        h, w = img.shape[:2]
+        pad_bottom = -h % 8
+        tiles.append(cv2.copyMakeBorder(img, 0, pad_bottom, 0, sheet_width - w,
+                                        cv2.BORDER_CONSTANT, value=(255, 255, 255)))
+        layout[name] = {"y": y, "width": w, "height": h}
+        y += h + pad_bottom
+
+    return cv2.vconcat(tiles), layout
 
 
 def process_single_pdf(pdf_path, output_folder):
@@ -232,8 +717,9 @@ def process_single_pdf(pdf_path, output_folder):
         "filepath": str(pdf_path),
         "status": "error",
         "images": {},
+        "sprite_sheet": None,
         "skew_angle": 0,
-        "base64_scan": None,
+        "scan_image": None,
         "ocr_results": {}  # OCR結果を追加
     }
 
@@ -242,30 +728,26 @@ def process_single_pdf(pdf_path, output_folder):
         ocr_data = load_ocr_result(pdf_path)
 
         # OCR結果を整形して保存
-        if ocr_data:
-            # 医療機関名
-            if "医療機関名" in ocr_data:
-                result["ocr_results"]["医療機関名"] = ocr_data["医療機関名"]
-
-            # 患者さんID
-            if "患者さんID" in ocr_data:
-                result["ocr_results"]["患者さんID"] = format_ocr_value("患者さんID", ocr_data["患者さんID"])
-
-            # 回答データ
-            if "回答データ" in ocr_data:
-                for key, value in ocr_data["回答データ"].items():
-                    result["ocr_results"][key] = format_ocr_value(key, value)
+        result["ocr_results"] = extract_ocr_results(ocr_data)
 
         # PDFを画像に変換
         image = pdf_to_image(pdf_path)
 
-        # 傾斜補正
-        deskewer = ImageDeskewer()
-        corrected_image, skew_angle = deskewer.deskew(image, method="template")
+        # 傾斜補正（Leptonicaを優先し、使えない・信頼度が低い場合はテンプレート方式）
+        deskewed = deskew_leptonica(image) if HAS_LEPTONICA else None
+        if deskewed is None:
+            deskewed = ImageDeskewer().deskew(image, method="template")
+        corrected_image, skew_angle = deskewed
         result["skew_angle"] = skew_angle
 
-        # スキャン画像をBase64に変換
-        result["base64_scan"] = image_to_base64(corrected_image)
+        os.makedirs(output_folder, exist_ok=True)
+
+        # スキャン画像はメモリに保持せずディスクに保存し、相対パスのみ記録
+        # （縮小版を保存。原寸の corrected_image は以降の領域検出・切り出しに使用）
+        scan_path = output_folder / "scan.jpg"
+        with open(scan_path, 'wb') as f:
+            f.write(encode_jpeg(make_scan_preview(corrected_image)))
+        result["scan_image"] = str(scan_path.relative_to(OUTPUT_DIR)).replace("\\", "/")
 
         # 基準点を自動検出
         detection_info = detect_paper_region(corrected_image)
@@ -276,14 +758,23 @@ def process_single_pdf(pdf_path, output_folder):
         # 各質問領域を切り取り
         cropped_images = crop_regions(corrected_image, regions)
 
-        # 切り取り画像を保存
-        os.makedirs(output_folder, exist_ok=True)
-        saved_paths = save_cropped_images(cropped_images, output_folder)
+        # 切り取り画像を1枚のシート画像にまとめて保存（領域ごとのPNG書き出しを省く）
+        sheet, layout = build_sprite_sheet(cropped_images)
+        sheet_path = output_folder / "sheet.jpg"
+        with open(sheet_path, 'wb') as f:
+            f.write(encode_jpeg(sheet, quality=SHEET_JPEG_QUALITY))
+
+        # シート内の各領域の位置を記録
+        result["images"] = layout
+        result["sprite_sheet"] = {
+            "path": str(sheet_path.relative_to(OUTPUT_DIR)).replace("\\", "/"),
+            "width": sheet.shape[1],
+            "height": sheet.shape[0],
+        }
 
-        # 画像パスを相対パスで記録
-        for name, path in saved_paths.items():
-            rel_path = path.relative_to(OUTPUT_DIR)
-            result["images"][name] = str(rel_path).replace("\\", "/")
+        # 画像URLのキャッシュ無効化用バージョン（画像の更新時刻, ns）
+        # 1年キャッシュさせるため秒単位では足りない。JSの数値では桁が落ちるので文字列で渡す
+        result["version"] = str(sheet_path.stat().st_mtime_ns)
 
         result["status"] = "success"
         result["question_count"] = len(regions)
@@ -291,14 +782,132 @@ def process_single_pdf(pdf_path, output_folder):
     except Exception as e:
         result["error"] = str(e)
         print(f"    エラー: {e}")
+        return result
+
+    # 確認済みになった後の再実行で再処理を省くため、処理結果を保存
+    # （保存できなくても処理結果自体は有効なので、メッセージを出すだけにする）
+    try:
+        write_json_atomic(output_folder / RESULT_CACHE_NAME, result, indent=False)
+    except Exception as e:
+        print(f"    処理結果キャッシュの保存に失敗: {e}")
+
+    return result
+
+
+def load_cached_result(pdf_path, output_folder):
+    """
+    確認済みPDFの前回処理結果を読み込む
+
+    PDFより新しい _verified.json があり、処理結果キャッシュと画像が
+    残っている場合のみ再利用する。
+
+    Returns:
+        dict: 処理結果、再利用できない場合は None
+    """
+    verified_path = pdf_path.with_name(pdf_path.stem + "_verified.json")
+    try:
+        if verified_path.stat().st_mtime <= pdf_path.stat().st_mtime:
+            return None
+        with open(output_folder / RESULT_CACHE_NAME, 'rb') as f:
+            cached = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+    if cached.get("status") != "success":
+        return None
+    if not (OUTPUT_DIR / cached["sprite_sheet"]["path"]).exists():
+        return None
+
+    cached["verified"] = True
+    return cached
+
+
+def prepare_pdf(index, pdf_path):
+    """
+    1ファイル分の事前処理（確認済みなら前回の結果を再利用）
+
+    Returns:
+        dict: 処理結果（index, folder 付き）
+    """
+    safe_name = pdf_path.stem.replace(" ", "_")
+    output_folder = BATCH_DATA_DIR / safe_name
 
+    result = load_cached_result(pdf_path, output_folder)
+    if result is None:
+        result = process_single_pdf(pdf_path, output_folder)
+    result["index"] = index
+    result["folder"] = safe_name
     return result
 
 
-def process_all_pdfs():
+class PrefetchQueue:
+    """
+    照合中の先読み処理
+
+    要求されたファイルの処理を待つ間も、その先 depth 件を
+    バックグラウンドのプロセスプールで処理しておく。
+    """
+
+    def __init__(self, all_results, depth=PREFETCH_DEPTH):
+        self.depth = depth
+        self._paths = {r["index"]: Path(r["filepath"]) for r in all_results}
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(max_workers=min(MAX_WORKERS, depth + 1))
+
+        # 処理済みの結果はそのまま返す
+        for result in all_results:
+            if result["status"] != "pending":
+                future = Future()
+                future.set_result(result)
+                self._futures[result["index"]] = future
+
+    def prefetch(self, start):
+        """start から depth 件先までの処理を開始"""
+        with self._lock:
+            for index in range(start, start + self.depth + 1):
+                if index in self._futures or index not in self._paths:
+                    continue
+                pdf_path = self._paths[index]
+                future = self._executor.submit(prepare_pdf, index, pdf_path)
+                future.add_done_callback(
+                    lambda f, name=pdf_path.name: print(f"    [先読み完了] {name}"))
+                self._futures[index] = future
+
+    def get(self, index):
+        """index のファイルの処理結果を返す（処理完了まで待つ）"""
+        if index not in self._paths:
+            raise IndexError(f"ファイル番号が範囲外です: {index}")
+
+        self.prefetch(index)
+        with self._lock:
+            future = self._futures[index]
+
+        try:
+            return future.result()
+        except Exception as e:
+            # ワーカープロセス自体の異常終了
+            return {
+                "index": index,
+                "filename": self._paths[index].name,
+                "filepath": str(self._paths[index]),
+                "status": "error",
+                "error": str(e),
+            }
+
+    def shutdown(self):
+        """未着手の先読みを取り消して停止"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def process_all_pdfs(eager_count=None):
     """
     全PDFファイルを処理
 
+    Args:
+        eager_count: 先に処理する未処理ファイルの件数（None なら全件）。
+                     超えた分は status="pending" の結果として返し、照合中に先読みする
+
     Returns:
         list: 各ファイルの処理結果
     """
@@ -315,823 +924,161 @@ def process_all_pdfs():
 
     all_results = []
 
-    for i, pdf_path in enumerate(pdf_files):
-        print(f"\n[{i+1}/{len(pdf_files)}] {pdf_path.name}")
+    # PDFごとの処理は独立しているため、プロセスプールで並列実行する
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for i, pdf_path in enumerate(pdf_files):
+            # 各PDFごとのフォルダを作成
+            safe_name = pdf_path.stem.replace(" ", "_")
+            output_folder = BATCH_DATA_DIR / safe_name
+
+            # 確認済みのファイルは前回の処理結果を再利用（PDF描画から省略）
+            cached = load_cached_result(pdf_path, output_folder)
+            if cached is not None:
+                cached["index"] = i
+                cached["folder"] = safe_name
+                all_results.append(cached)
+                print(f"\n[スキップ] {pdf_path.name}（確認済み）")
+                continue
+
+            if eager_count is not None and len(futures) >= eager_count:
+                all_results.append({
+                    "index": i,
+                    "filename": pdf_path.name,
+                    "filepath": str(pdf_path),
+                    "folder": safe_name,
+                    "status": "pending",
+                })
+                continue
+
+            future = executor.submit(process_single_pdf, pdf_path, output_folder)
+            futures[future] = (i, pdf_path, safe_name)
+
+        for done, future in enumerate(as_completed(futures), 1):
+            i, pdf_path, safe_name = futures[future]
+            print(f"\n[{done}/{len(futures)}] {pdf_path.name}")
 
-        # 各PDFごとのフォルダを作成
-        safe_name = pdf_path.stem.replace(" ", "_")
-        output_folder = BATCH_DATA_DIR / safe_name
+            try:
+                result = future.result()
+            except Exception as e:
+                # ワーカープロセス自体の異常終了
+                result = {
+                    "filename": pdf_path.name,
+                    "filepath": str(pdf_path),
+                    "status": "error",
+                    "error": str(e),
+                }
+            result["index"] = i
+            result["folder"] = safe_name
+            all_results.append(result)
+
+            if result["status"] == "success":
+                print(f"    完了: {result['question_count']}項目検出")
+            else:
+                print(f"    失敗: {result.get('error', '不明なエラー')}")
+
+    # 完了順に集まるため、元のファイル順に並べ直す
+    all_results.sort(key=lambda r: r["index"])
 
-        result = process_single_pdf(pdf_path, output_folder)
-        result["index"] = i
-        result["folder"] = safe_name
-        all_results.append(result)
+    return all_results
 
-        if result["status"] == "success":
-            print(f"    完了: {result['question_count']}項目検出")
-        else:
-            print(f"    失敗: {result.get('error', '不明なエラー')}")
 
-    return all_results
+def _manifest_entry(result):
+    """処理結果1件分のマニフェスト要素"""
+    ocr_results = result.get("ocr_results", {})
+    return {
+        "index": result["index"],
+        "filename": result["filename"],
+        "filepath": result["filepath"],
+        "folder": result["folder"],
+        "images": result["images"],
+        "sprite_sheet": result["sprite_sheet"],
+        "skew_angle": result["skew_angle"],
+        "scan_image": result["scan_image"],
+        "version": result["version"],
+        "ocr_results": ocr_results,  # OCR結果を追加
+        # 表示用にHTMLエスケープ済みのOCR結果（ファイル切り替えごとのJS側エスケープを省く）
+        "ocr_results_escaped": {
+            key: html.escape(str(value), quote=True) for key, value in ocr_results.items()
+        },
+        "confirmed": result.get("verified", False),
+        "results": {}
+    }
+
+
+def _pending_manifest_entry(result):
+    """未処理ファイルのマニフェスト要素（照合画面で選択時に /nextfile から取得）"""
+    return {
+        "index": result["index"],
+        "filename": result["filename"],
+        "pending": True,
+        "confirmed": False,
+        "results": {}
+    }
+
+
+def write_manifest(all_results):
+    """
+    成功・未処理のファイルのデータを batch_data/manifest.json に書き出す
+
+    全件のリストを作らず1件ずつJSON配列の要素として書き込む。
+    一時ファイルに書いてから置き換えるため、書き込み途中のものは読まれない。
+    """
+    os.makedirs(MANIFEST_PATH.parent, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=MANIFEST_PATH.parent,
+                                    prefix=MANIFEST_PATH.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'[')
+            first = True
+            for result in all_results:
+                if result["status"] == "success":
+                    entry = _manifest_entry(result)
+                elif result["status"] == "pending":
+                    entry = _pending_manifest_entry(result)
+                else:
+                    continue
+                if not first:
+                    f.write(b',')
+                # サイズを抑えるため、インデントなしの最小表現で出力
+                f.write(json_dumps(entry))
+                first = False
+            f.write(b']')
+        os.replace(tmp_path, MANIFEST_PATH)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return MANIFEST_PATH
+
+
+@functools.lru_cache(maxsize=1)
+def _load_html_template():
+    """
+    バッチ照合画面のテンプレートを読み込む（プロセス内で1回だけ）
+
+    JavaScriptのテンプレートリテラル `${...}` をそのまま残すため、
+    差し込みは safe_substitute で行う
+    """
+    return Template(HTML_TEMPLATE_PATH.read_text(encoding='utf-8'))
 
 
 def create_batch_verification_html(all_results):
     """
     バッチ照合用HTMLを生成
 
-    全ファイルのデータを含み、JavaScript でファイルを切り替える
+    全ファイルのデータは batch_data/manifest.json に書き出し、
+    HTMLからfetchで読み込んでJavaScriptでファイルを切り替える
     """
 
-    # ファイルデータをJSON形式で埋め込み
-    files_data = []
-    for result in all_results:
-        if result["status"] != "success":
-            continue
-
-        file_data = {
-            "index": result["index"],
-            "filename": result["filename"],
-            "filepath": result["filepath"],
-            "folder": result["folder"],
-            "images": result["images"],
-            "skew_angle": result["skew_angle"],
-            "base64_scan": result["base64_scan"],
-            "ocr_results": result.get("ocr_results", {}),  # OCR結果を追加
-            "confirmed": False,
-            "results": {}
-        }
-        files_data.append(file_data)
+    # ファイルデータをマニフェストJSONとして保存
+    write_manifest(all_results)
 
-    files_json = json.dumps(files_data, ensure_ascii=False, indent=2)
     question_order_json = json.dumps(QUESTION_ORDER, ensure_ascii=False)
 
-    html_content = f'''<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>アンケート照合 - バッチモード</title>
-    <style>
-        * {{
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: 'Meiryo', sans-serif;
-            margin: 0;
-            padding: 0;
-            display: flex;
-            height: 100vh;
-            background: #f5f5f5;
-        }}
-
-        /* サイドバー（ファイル一覧） */
-        .sidebar {{
-            width: 280px;
-            background: #2c3e50;
-            color: white;
-            overflow-y: auto;
-            flex-shrink: 0;
-        }}
-        .sidebar-header {{
-            padding: 15px;
-            background: #1a252f;
-            font-size: 16px;
-            font-weight: bold;
-            border-bottom: 1px solid #34495e;
-        }}
-        .file-list {{
-            list-style: none;
-            padding: 0;
-            margin: 0;
-        }}
-        .file-item {{
-            padding: 12px 15px;
-            cursor: pointer;
-            border-bottom: 1px solid #34495e;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            transition: background 0.2s;
-        }}
-        .file-item:hover {{
-            background: #34495e;
-        }}
-        .file-item.active {{
-            background: #3498db;
-        }}
-        .file-item.completed {{
-            background: #27ae60;
-        }}
-        .file-item.completed.active {{
-            background: #2ecc71;
-        }}
-        .file-status {{
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            background: #7f8c8d;
-            flex-shrink: 0;
-        }}
-        .file-item.completed .file-status {{
-            background: #2ecc71;
-        }}
-        .file-name {{
-            flex: 1;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            white-space: nowrap;
-            font-size: 13px;
-        }}
-        .file-index {{
-            color: #95a5a6;
-            font-size: 11px;
-        }}
-
-        /* メインエリア */
-        .main-area {{
-            flex: 1;
-            display: flex;
-            flex-direction: column;
-            overflow: hidden;
-        }}
-
-        /* ヘッダー（ナビゲーション） */
-        .nav-header {{
-            background: white;
-            padding: 15px 20px;
-            display: flex;
-            align-items: center;
-            gap: 20px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            flex-shrink: 0;
-        }}
-        .nav-button {{
-            padding: 8px 16px;
-            font-size: 14px;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-            transition: background 0.2s;
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }}
-        .nav-button:disabled {{
-            opacity: 0.3;
-            cursor: not-allowed;
-        }}
-        .nav-button.prev {{
-            background: #95a5a6;
-            color: white;
-        }}
-        .nav-button.prev:hover:not(:disabled) {{
-            background: #7f8c8d;
-        }}
-        .nav-button.next {{
-            background: #3498db;
-            color: white;
-        }}
-        .nav-button.next:hover:not(:disabled) {{
-            background: #2980b9;
-        }}
-        .current-file {{
-            flex: 1;
-            font-size: 18px;
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-        .progress-info {{
-            color: #7f8c8d;
-            font-size: 14px;
-        }}
-
-        /* コンテンツエリア */
-        .content-area {{
-            flex: 1;
-            overflow-y: auto;
-            padding: 20px;
-        }}
-
-        /* 質問ブロック */
-        .question-block {{
-            background: white;
-            margin: 15px 0;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .question-block.confirmed {{
-            background: #f1f8e9;
-            border-left: 4px solid #4CAF50;
-        }}
-        .question-title {{
-            font-size: 16px;
-            font-weight: bold;
-            color: #2196F3;
-            margin-bottom: 15px;
-        }}
-        .question-block.confirmed .question-title {{
-            color: #4CAF50;
-        }}
-        .image-section {{
-            margin-bottom: 15px;
-        }}
-        .image-section img {{
-            max-width: 100%;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-        }}
-        .result-section {{
-            display: flex;
-            align-items: center;
-            gap: 15px;
-            justify-content: flex-end;
-        }}
-        .result-label {{
-            font-weight: bold;
-            color: #666;
-            flex-shrink: 0;
-        }}
-        .result-title {{
-            color: #2196F3;
-            font-weight: bold;
-            margin-right: 10px;
-        }}
-        .result-input {{
-            font-size: 16px;
-            padding: 10px 15px;
-            background: #e8f5e9;
-            border: 2px solid #a5d6a7;
-            border-radius: 4px;
-            min-width: 200px;
-            font-family: inherit;
-        }}
-        .result-input:focus {{
-            outline: none;
-            border-color: #4CAF50;
-            background: #fff;
-        }}
-        .result-input.confirmed {{
-            background: #c8e6c9;
-            border-color: #4CAF50;
-        }}
-        .result-input:disabled {{
-            background: #c8e6c9;
-            color: #333;
-        }}
-        textarea.result-input {{
-            resize: vertical;
-            min-height: 60px;
-        }}
-        .ok-button {{
-            padding: 8px 16px;
-            background: #4CAF50;
-            color: white;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 14px;
-            display: flex;
-            align-items: center;
-            gap: 4px;
-        }}
-        .ok-button:hover {{
-            background: #388E3C;
-        }}
-        .ok-button:disabled {{
-            background: #a5d6a7;
-            cursor: not-allowed;
-        }}
-        .edit-button {{
-            padding: 8px 16px;
-            background: #ff9800;
-            color: white;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 14px;
-            display: none;
-            align-items: center;
-            gap: 4px;
-        }}
-        .edit-button:hover {{
-            background: #f57c00;
-        }}
-        .question-block.confirmed .edit-button {{
-            display: flex;
-        }}
-        .question-block.confirmed .ok-button {{
-            display: none;
-        }}
-
-        /* フッター（保存ボタン） */
-        .footer {{
-            background: white;
-            padding: 15px 20px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 20px;
-            box-shadow: 0 -2px 4px rgba(0,0,0,0.1);
-            flex-shrink: 0;
-        }}
-        .save-button {{
-            padding: 15px 40px;
-            font-size: 16px;
-            font-weight: bold;
-            border: none;
-            border-radius: 4px;
-            cursor: pointer;
-        }}
-        .save-button.complete {{
-            background: #27ae60;
-            color: white;
-        }}
-        .save-button.complete:hover {{
-            background: #219a52;
-        }}
-        .save-button.complete:disabled {{
-            background: #95a5a6;
-            cursor: not-allowed;
-        }}
-        .status-message {{
-            padding: 10px;
-            border-radius: 4px;
-            display: none;
-        }}
-        .status-message.success {{
-            display: block;
-            background: #d4edda;
-            color: #155724;
-        }}
-        .status-message.error {{
-            display: block;
-            background: #f8d7da;
-            color: #721c24;
-        }}
-
-        /* ヘルプボタン */
-        .help-button {{
-            position: fixed;
-            bottom: 20px;
-            right: 20px;
-            width: 40px;
-            height: 40px;
-            background: #3498db;
-            color: white;
-            border: none;
-            border-radius: 50%;
-            cursor: pointer;
-            font-size: 20px;
-            font-weight: bold;
-            z-index: 100;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-        }}
-        .help-button:hover {{
-            background: #2980b9;
-        }}
-
-        /* キーボードショートカットヘルプ（ポップアップ） */
-        .shortcuts-help {{
-            position: fixed;
-            bottom: 70px;
-            right: 20px;
-            background: rgba(0,0,0,0.9);
-            color: white;
-            padding: 15px 20px;
-            border-radius: 8px;
-            font-size: 13px;
-            z-index: 100;
-            display: none;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-        }}
-        .shortcuts-help.show {{
-            display: block;
-        }}
-        .shortcuts-help h4 {{
-            margin: 0 0 10px 0;
-            font-size: 14px;
-            border-bottom: 1px solid #555;
-            padding-bottom: 8px;
-        }}
-        .shortcuts-help div {{
-            margin: 6px 0;
-        }}
-        .shortcuts-help kbd {{
-            background: #555;
-            padding: 3px 8px;
-            border-radius: 3px;
-            margin-right: 8px;
-            font-family: monospace;
-        }}
-    </style>
-</head>
-<body>
-    <!-- サイドバー -->
-    <div class="sidebar">
-        <div class="sidebar-header">
-            ファイル一覧 (<span id="completed-count">0</span>/<span id="total-count">0</span>)
-        </div>
-        <ul class="file-list" id="file-list">
-        </ul>
-    </div>
-
-    <!-- メインエリア -->
-    <div class="main-area">
-        <!-- ナビゲーションヘッダー -->
-        <div class="nav-header">
-            <button class="nav-button prev" onclick="prevFile()" id="prev-btn" title="前へ">◀ 前へ</button>
-            <div class="current-file" id="current-file">ファイルを選択してください</div>
-            <div class="progress-info" id="progress-info"></div>
-            <button class="nav-button next" onclick="nextFile()" id="next-btn" title="次へ">次へ ▶</button>
-        </div>
-
-        <!-- コンテンツエリア -->
-        <div class="content-area" id="content-area">
-            <p style="text-align: center; color: #7f8c8d; margin-top: 100px;">
-                左のファイル一覧からファイルを選択してください
-            </p>
-        </div>
-
-        <!-- フッター -->
-        <div class="footer">
-            <button class="save-button complete" onclick="saveAndNext()" id="save-btn" disabled>
-                確認完了・保存して次へ
-            </button>
-            <div class="status-message" id="status-message"></div>
-        </div>
-    </div>
-
-    <!-- ヘルプボタン -->
-    <button class="help-button" onclick="toggleHelp()" title="操作方法">?</button>
-
-    <!-- キーボードショートカット（ポップアップ） -->
-    <div class="shortcuts-help" id="shortcuts-help">
-        <h4>操作方法</h4>
-        <div style="margin-bottom: 8px; color: #aaa;">キーボード</div>
-        <div><kbd>←</kbd> 前のファイル</div>
-        <div><kbd>→</kbd> 次のファイル</div>
-        <div><kbd>Enter</kbd> 保存して次へ</div>
-        <div><kbd>Shift</kbd>+<kbd>Enter</kbd> 全項目OK</div>
-        <div style="margin-top: 12px; margin-bottom: 8px; color: #aaa;">ボタン</div>
-        <div><span style="background:#4CAF50;color:white;padding:2px 8px;border-radius:3px;margin-right:8px;">✓ OK</span> 項目を確定</div>
-        <div><span style="background:#ff9800;color:white;padding:2px 8px;border-radius:3px;margin-right:8px;">✎ 編集</span> 確定を解除して編集</div>
-        <div style="margin-top: 12px; margin-bottom: 8px; color: #aaa;">保存</div>
-        <div style="font-size: 12px;">保存先: Scan Data フォルダ</div>
-        <div style="font-size: 12px;">ファイル名: [元PDF名]_verified.json</div>
-        <div style="margin-top: 10px; color: #aaa; font-size: 11px;">クリックで閉じる</div>
-    </div>
-
-    <script>
-        // ファイルデータ
-        const filesData = {files_json};
-        const questionOrder = {question_order_json};
-
-        // 現在の状態
-        let currentFileIndex = -1;
-        let confirmedItems = {{}};
-
-        // ヘルプ表示切り替え
-        function toggleHelp() {{
-            const help = document.getElementById('shortcuts-help');
-            help.classList.toggle('show');
-        }}
-
-        // ヘルプをクリックで閉じる
-        document.getElementById('shortcuts-help').addEventListener('click', function() {{
-            this.classList.remove('show');
-        }});
-
-        // 初期化
-        function init() {{
-            document.getElementById('total-count').textContent = filesData.length;
-            renderFileList();
-            updateCompletedCount();
-
-            // 最初のファイルを選択
-            if (filesData.length > 0) {{
-                selectFile(0);
-            }}
-        }}
-
-        // ファイル一覧を描画
-        function renderFileList() {{
-            const list = document.getElementById('file-list');
-            list.innerHTML = '';
-
-            filesData.forEach((file, index) => {{
-                const li = document.createElement('li');
-                li.className = 'file-item' + (file.confirmed ? ' completed' : '');
-                li.onclick = () => selectFile(index);
-                li.innerHTML = `
-                    <span class="file-status"></span>
-                    <span class="file-name">${{file.filename}}</span>
-                    <span class="file-index">#${{index + 1}}</span>
-                `;
-                list.appendChild(li);
-            }});
-        }}
-
-        // ファイルを選択
-        function selectFile(index) {{
-            if (index < 0 || index >= filesData.length) return;
-
-            // 前のファイルの状態を保存
-            if (currentFileIndex >= 0) {{
-                saveCurrentState();
-            }}
-
-            currentFileIndex = index;
-            const file = filesData[index];
-
-            // UI更新
-            document.querySelectorAll('.file-item').forEach((item, i) => {{
-                item.classList.toggle('active', i === index);
-            }});
-
-            document.getElementById('current-file').textContent = file.filename;
-            document.getElementById('progress-info').textContent =
-                `${{index + 1}} / ${{filesData.length}}`;
-
-            // ナビゲーションボタン
-            document.getElementById('prev-btn').disabled = (index === 0);
-            document.getElementById('next-btn').disabled = (index === filesData.length - 1);
-
-            // コンテンツを描画
-            renderQuestions(file);
-
-            // 保存ボタンの状態
-            updateSaveButton();
-        }}
-
-        // 質問を描画
-        function renderQuestions(file) {{
-            const content = document.getElementById('content-area');
-            let html = '';
-
-            questionOrder.forEach((name, qIndex) => {{
-                const imagePath = file.images[name];
-                if (!imagePath) return;
-
-                const isConfirmed = file.results[name] !== undefined;
-                // 確定済みの値、またはOCR結果、またはを空文字を初期値として使用
-                const value = file.results[name] || file.ocr_results[name] || '';
-
-                // 入力フィールドのタイプを決定
-                let inputElement;
-                const inputId = `input_${{qIndex}}`;
-
-                // 特殊文字をエスケープ
-                const escapedValue = value.replace(/"/g, '&quot;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
-
-                if (name === '質問13_飲酒習慣' || name === '質問15_コメント') {{
-                    inputElement = `<textarea id="${{inputId}}" class="result-input${{isConfirmed ? ' confirmed' : ''}}"
-                        rows="5" style="min-width: 500px;" ${{isConfirmed ? 'disabled' : ''}}>${{value}}</textarea>`;
-                }} else if (['質問1_名前', '質問2_生年月日', '質問5_身体情報'].includes(name)) {{
-                    inputElement = `<textarea id="${{inputId}}" class="result-input${{isConfirmed ? ' confirmed' : ''}}"
-                        rows="2" style="min-width: 350px;" ${{isConfirmed ? 'disabled' : ''}}>${{value}}</textarea>`;
-                }} else {{
-                    inputElement = `<input type="text" id="${{inputId}}" class="result-input${{isConfirmed ? ' confirmed' : ''}}"
-                        value="${{escapedValue}}" ${{isConfirmed ? 'disabled' : ''}}>`;
-                }}
-
-                html += `
-                <div class="question-block${{isConfirmed ? ' confirmed' : ''}}" id="block_${{qIndex}}" data-name="${{name}}">
-                    <div class="question-title">${{name}}</div>
-                    <div class="image-section">
-                        <img src="batch_data/${{file.folder}}/${{imagePath.split('/').pop()}}" alt="${{name}}">
-                    </div>
-                    <div class="result-section">
-                        <span class="result-label">読み取り結果:</span>
-                        <span class="result-title">${{name}}</span>
-                        ${{inputElement}}
-                        <button class="ok-button" onclick="confirmItem(${{qIndex}})" title="確定">✓ OK</button>
-                        <button class="edit-button" onclick="editItem(${{qIndex}})" title="編集">✎ 編集</button>
-                    </div>
-                </div>
-                `;
-            }});
-
-            content.innerHTML = html;
-        }}
-
-        // 項目を確定
-        function confirmItem(qIndex) {{
-            const block = document.getElementById('block_' + qIndex);
-            const input = document.getElementById('input_' + qIndex);
-            const name = block.dataset.name;
-
-            // 現在のファイルに結果を保存
-            filesData[currentFileIndex].results[name] = input.value;
-
-            // UI更新
-            block.classList.add('confirmed');
-            input.classList.add('confirmed');
-            input.disabled = true;
-
-            updateSaveButton();
-        }}
-
-        // 項目を編集
-        function editItem(qIndex) {{
-            const block = document.getElementById('block_' + qIndex);
-            const input = document.getElementById('input_' + qIndex);
-            const name = block.dataset.name;
-
-            // 確定を解除
-            delete filesData[currentFileIndex].results[name];
-
-            // UI更新
-            block.classList.remove('confirmed');
-            input.classList.remove('confirmed');
-            input.disabled = false;
-            input.focus();
-
-            updateSaveButton();
-        }}
-
-        // 全項目を確定
-        function confirmAllItems() {{
-            questionOrder.forEach((name, qIndex) => {{
-                const block = document.getElementById('block_' + qIndex);
-                if (block && !block.classList.contains('confirmed')) {{
-                    confirmItem(qIndex);
-                }}
-            }});
-        }}
-
-        // 現在の状態を保存
-        function saveCurrentState() {{
-            if (currentFileIndex < 0) return;
-
-            // 入力値を保存
-            questionOrder.forEach((name, qIndex) => {{
-                const input = document.getElementById('input_' + qIndex);
-                if (input && !input.disabled) {{
-                    // 未確定の値も一時保存
-                }}
-            }});
-        }}
-
-        // 保存ボタンの状態を更新
-        function updateSaveButton() {{
-            if (currentFileIndex < 0) return;
-
-            const file = filesData[currentFileIndex];
-            const confirmedCount = Object.keys(file.results).length;
-            const totalCount = Object.keys(file.images).length;
-
-            const btn = document.getElementById('save-btn');
-            // 1つ以上確定していれば保存可能（全項目必須ではない）
-            btn.disabled = false;
-
-            if (confirmedCount >= totalCount) {{
-                btn.textContent = '確認完了・保存して次へ';
-            }} else {{
-                btn.textContent = `保存して次へ (${{confirmedCount}}/${{totalCount}} 確定)`;
-            }}
-        }}
-
-        // 完了数を更新
-        function updateCompletedCount() {{
-            const count = filesData.filter(f => f.confirmed).length;
-            document.getElementById('completed-count').textContent = count;
-            renderFileList();
-        }}
-
-        // 保存して次へ（確認ダイアログ付き）
-        async function saveAndNext() {{
-            if (currentFileIndex < 0) return;
-
-            const file = filesData[currentFileIndex];
-
-            // ファイル名: PDFと同名_verified.json
-            const baseName = file.filename.replace(/\\.pdf$/i, '');
-            const defaultFilename = `${{baseName}}_verified.json`;
-
-            // 確認ダイアログを表示
-            const saveFilename = prompt(
-                '保存するファイル名を確認してください。\\n\\n保存先: Scan Data フォルダ',
-                defaultFilename
-            );
-
-            // キャンセルされた場合は中止
-            if (saveFilename === null) {{
-                return;
-            }}
-
-            // 空のファイル名チェック
-            if (!saveFilename.trim()) {{
-                showStatus('ファイル名が空です', 'error');
-                return;
-            }}
-
-            // JSONデータを生成
-            const jsonData = {{
-                "ファイル名": file.filename,
-                "元ファイルパス": file.filepath,
-                "照合日時": new Date().toISOString(),
-                "傾斜角度": file.skew_angle,
-                "医療機関名": file.results["医療機関名"] || file.ocr_results["医療機関名"] || "",
-                "患者さんID": file.results["患者さんID"] || file.ocr_results["患者さんID"] || "",
-                "回答データ": {{}},
-                "スキャン画像_base64": file.base64_scan
-            }};
-
-            // 回答データを整理
-            questionOrder.forEach(name => {{
-                if (name !== "医療機関名" && name !== "患者さんID") {{
-                    jsonData["回答データ"][name] = file.results[name] || file.ocr_results[name] || "";
-                }}
-            }});
-
-            // サーバーに保存リクエスト
-            try {{
-                const response = await fetch('/save', {{
-                    method: 'POST',
-                    headers: {{
-                        'Content-Type': 'application/json'
-                    }},
-                    body: JSON.stringify({{
-                        filename: saveFilename,
-                        data: jsonData
-                    }})
-                }});
-
-                const result = await response.json();
-
-                if (result.status === 'success') {{
-                    // 完了マーク
-                    file.confirmed = true;
-                    updateCompletedCount();
-
-                    // ステータスメッセージ
-                    showStatus('保存完了: ' + saveFilename, 'success');
-
-                    // 次のファイルへ
-                    setTimeout(() => {{
-                        if (currentFileIndex < filesData.length - 1) {{
-                            selectFile(currentFileIndex + 1);
-                        }} else {{
-                            showStatus('全てのファイルの照合が完了しました！', 'success');
-                        }}
-                    }}, 500);
-                }} else {{
-                    showStatus('保存エラー: ' + result.message, 'error');
-                }}
-            }} catch (error) {{
-                showStatus('通信エラー: ' + error.message, 'error');
-            }}
-        }}
-
-        // ステータスメッセージを表示
-        function showStatus(message, type) {{
-            const el = document.getElementById('status-message');
-            el.textContent = message;
-            el.className = 'status-message ' + type;
-
-            setTimeout(() => {{
-                el.className = 'status-message';
-            }}, 3000);
-        }}
-
-        // ナビゲーション
-        function prevFile() {{
-            if (currentFileIndex > 0) {{
-                selectFile(currentFileIndex - 1);
-            }}
-        }}
-
-        function nextFile() {{
-            if (currentFileIndex < filesData.length - 1) {{
-                selectFile(currentFileIndex + 1);
-            }}
-        }}
-
-        // キーボードショートカット
-        document.addEventListener('keydown', (e) => {{
-            if (e.key === 'ArrowLeft') {{
-                prevFile();
-            }} else if (e.key === 'ArrowRight') {{
-                nextFile();
-            }} else if (e.key === 'Enter' && e.shiftKey) {{
-                e.preventDefault();
-                confirmAllItems();
-            }} else if (e.key === 'Enter' && !e.target.matches('textarea')) {{
-                e.preventDefault();
-                const btn = document.getElementById('save-btn');
-                if (!btn.disabled) {{
-                    saveAndNext();
-                }}
-            }}
-        }});
-
-        // 初期化実行
-        init();
-    </script>
-</body>
-</html>
-'''
+    # HTMLテンプレートにJSONを差し込む
+    html_content = _load_html_template().safe_substitute(
+        question_order_json=question_order_json)
 
     html_path = OUTPUT_DIR / "batch_verification.html"
     with open(html_path, 'w', encoding='utf-8') as f:
@@ -1149,9 +1096,9 @@ def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     os.makedirs(CHECKED_DATA_DIR, exist_ok=True)
 
-    # 全PDFを処理
-    print("\n[1] 全PDFファイルを処理中...")
-    all_results = process_all_pdfs()
+    # 先頭の数件を処理（残りは照合中に先読み）
+    print("\n[1] PDFファイルを処理中...")
+    all_results = process_all_pdfs(eager_count=PREFETCH_EAGER_COUNT)
 
     if not all_results:
         print("\n処理するファイルがありません。")
@@ -1160,7 +1107,17 @@ def main():
 
     # 成功したファイル数
     success_count = sum(1 for r in all_results if r["status"] == "success")
+    pending_count = sum(1 for r in all_results if r["status"] == "pending")
     print(f"\n処理完了: {success_count}/{len(all_results)} ファイル")
+    if pending_count:
+        print(f"残り {pending_count} ファイルは照合中に先読みで処理します")
+
+    # 照合中の先読みを開始（最初の未処理ファイルから）
+    prefetch = PrefetchQueue(all_results)
+    VerificationHandler.prefetch = prefetch
+    first_pending = next((r["index"] for r in all_results if r["status"] == "pending"), None)
+    if first_pending is not None:
+        prefetch.prefetch(first_pending)
 
     # HTMLを生成
     print("\n[2] 照合用HTMLを生成中...")
@@ -1194,6 +1151,7 @@ def main():
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
+        prefetch.shutdown()
         print("\n\n終了しました。")
 
 
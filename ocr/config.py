@@ -340,6 +340,20 @@ CLAUDE_API = {
     "model": "claude-sonnet-4-20250514",
     "max_tokens": 4096,
     "temperature": 0,
+    # 同時に発行するAPIリクエスト数の上限（並列OCRのスレッド数も兼ねる）
+    "max_concurrent_requests": 8,
+    # HTTP接続プール（並列リクエストで接続を使い回す）とタイムアウト(秒)
+    "max_connections": 32,
+    "timeout": 60.0,
+    "connect_timeout": 5.0,
+    # 送信画像の長辺の上限(px)。これより大きい画像はClaude側で縮小される
+    "max_image_side": 1568,
+    # 全ページ画像をJPEGで送る場合の品質
+    "jpeg_quality": 90,
+    # この件数以上のページはMessage Batches APIで一括処理（非同期・半額）
+    "batch_threshold": 20,
+    # バッチ処理状況の確認間隔(秒)
+    "batch_poll_interval": 30,
 }
 
 OCR_PROMPT_TEMPLATE = """
@@ -363,6 +377,68 @@ JSON形式で回答してください。
 回答:
 """
 
+# 複数フィールドを1回のAPI呼び出しでまとめて読み取る場合のプロンプト
+OCR_GROUP_PROMPT_TEMPLATE = """
+これらの画像は糖化アンケートの一部です。画像は番号順に並んでおり、
+各画像について以下の項目を読み取ってください。
+
+【読み取り対象】
+{field_descriptions}
+
+【回答形式】
+画像の順番どおりに、{count}個の要素を持つJSON配列で回答してください。
+各要素は次の形式です:
+- 読み取れた値は "value" キーに設定
+- 信頼度は "confidence" キーに "high"/"medium"/"low" で設定
+- 読み取れない場合は "value": null
+
+【注意事項】
+- 手書き文字は丁寧に判読してください
+- チェックマーク（✓）や黒塗り（■）を検出してください
+- 数字は半角で出力してください
+- カタカナはそのまま出力してください
+
+JSON配列のみを出力してください（説明文は不要）。
+"""
+
+# 1ページ分のフィールドをまとめて読み取る場合のプロンプト（結果はフィールド名をキーにする）
+OCR_FIELDS_PROMPT_TEMPLATE = """
+これらの画像は糖化アンケートの1ページから切り出した各項目です。
+各画像の直前にフィールド名を示しています。
+
+【読み取り対象】
+{field_descriptions}
+
+【回答形式】
+フィールド名をキーとするJSONオブジェクトで回答してください。
+各値は次の形式です:
+- 読み取れた値は "value" キーに設定
+- 信頼度は "confidence" キーに "high"/"medium"/"low" で設定
+- 読み取れない場合は "value": null
+
+【注意事項】
+- 手書き文字は丁寧に判読してください
+- チェックマーク（✓）や黒塗り（■）を検出してください
+- 数字は半角で出力してください
+- カタカナはそのまま出力してください
+
+JSONのみを出力してください（説明文は不要）。
+"""
+
+
+# ============================================
+# PDF描画解像度 (DPI)
+# ============================================
+
+PDF_DPI = {
+    # 傾斜補正・領域切り出し・チェックボックス検出用（検出の画素しきい値はこの解像度前提）
+    "page": 300,
+    # Claude全ページOCR用（送信時に長辺1568pxへ縮小されるため高解像度は不要）
+    "full_page_ocr": 200,
+    # 手書きの小さな領域を高精細に読み直す場合（pdf_to_region）
+    "region": 400,
+}
+
 
 # ============================================
 # ファイルパス設定
@@ -374,4 +450,7 @@ PATHS = {
     "cropped_images": "cropped_images",
     "output_html": "cropped_images/verification.html",
     "output_json": "survey_result.json",
+    "ocr_batch_state": "cropped_images/ocr_batch.json",
+    "ocr_cache": "cropped_images/ocr_cache",
+    "template_cache": "cropped_images/template_cache",
 }
@@ -6,10 +6,16 @@ Claude APIを使用して画像からテキストを抽出
   v2.1 - 全ページプロンプトに「QRコードで回答」フィールド追加
 """
 
-import base64
+import functools
+import hashlib
 import json
 import os
-from typing import Dict, Any, Optional
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 try:
@@ -18,41 +24,168 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
+# HTTPクライアント（anthropicの依存。h2があればHTTP/2で多重化）
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
 try:
     import cv2
     HAS_CV2 = True
 except ImportError:
     HAS_CV2 = False
 
-from config import CLAUDE_API, OCR_PROMPT_TEMPLATE, RELATIVE_REGIONS
+# JSON処理（orjsonがあればC実装の高速版を使用）
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Base64変換（pybase64があればSIMD実装の高速版を使用）
+try:
+    import pybase64 as base64
+    HAS_PYBASE64 = True
+except ImportError:
+    import base64
+    HAS_PYBASE64 = False
+
+# 画像のハッシュ計算（blake3があればSIMD実装の高速版を使用）
+try:
+    from blake3 import blake3 as _new_hasher
+    HAS_BLAKE3 = True
+except ImportError:
+    _new_hasher = functools.partial(hashlib.blake2b, digest_size=32)
+    HAS_BLAKE3 = False
+
+from config import (
+    CLAUDE_API, OCR_PROMPT_TEMPLATE, OCR_GROUP_PROMPT_TEMPLATE,
+    OCR_FIELDS_PROMPT_TEMPLATE, RELATIVE_REGIONS, PATHS,
+)
+
+
+def json_loads(data):
+    """JSON文字列/バイト列をパース（失敗時は ValueError のサブクラスを送出）"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# 送信済みバッチの記録（再実行時に再送信せず結果を取得するため）
+BATCH_STATE_PATH = Path(__file__).parent / PATHS["ocr_batch_state"]
+# 全ページOCR結果のキャッシュ（画像内容のハッシュ → 結果JSON）
+CACHE_DIR = Path(__file__).parent / PATHS["ocr_cache"]
 
 
 class ClaudeOCR:
     """Claude APIを使用したOCR処理クラス"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True):
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+        self.use_cache = use_cache
 
         if HAS_ANTHROPIC and self.api_key:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            client_options = {}
+            if HAS_HTTPX:
+                client_options["http_client"] = self._create_http_client()
+            self.client = anthropic.Anthropic(api_key=self.api_key, **client_options)
         else:
             self.client = None
             if not self.api_key:
                 print("Warning: ANTHROPIC_API_KEY が設定されていません")
 
+        # スレッド間で共有するAPIリクエストの同時実行数上限（レート制限対策）
+        self.max_concurrent_requests = CLAUDE_API.get("max_concurrent_requests", 8)
+        self._request_slots = threading.BoundedSemaphore(self.max_concurrent_requests)
+
+    @staticmethod
+    def _create_http_client():
+        """接続プールを広げた永続httpxクライアント（h2があればHTTP/2）"""
+        max_connections = CLAUDE_API.get("max_connections", 32)
+        return httpx.Client(
+            http2=HAS_H2,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(CLAUDE_API.get("timeout", 60.0),
+                                  connect=CLAUDE_API.get("connect_timeout", 5.0)),
+        )
+
     def is_available(self) -> bool:
         return self.client is not None
 
-    def _image_to_base64(self, image) -> str:
-        """OpenCV画像 or ファイルパスをBase64に変換"""
+    def _image_to_base64(self, image, photo: bool = False) -> Tuple[str, str]:
+        """
+        OpenCV画像 or ファイルパスをBase64に変換
+
+        Args:
+            image: 画像（np.ndarray or ファイルパス）
+            photo: True なら全ページ画像としてJPEG、False なら文字の輪郭を保つPNG
+
+        Returns:
+            (Base64文字列, media_type)
+        """
         if isinstance(image, str):
+            media_type = "image/jpeg" if image.lower().endswith((".jpg", ".jpeg")) else "image/png"
             with open(image, "rb") as f:
-                return base64.standard_b64encode(f.read()).decode("utf-8")
+                return base64.standard_b64encode(f.read()).decode("utf-8"), media_type
         elif HAS_CV2:
-            _, buffer = cv2.imencode('.png', image)
-            return base64.standard_b64encode(buffer).decode("utf-8")
+            image = self._downscale_for_claude(image)
+            if photo:
+                _, buffer = cv2.imencode('.jpg', image, [
+                    cv2.IMWRITE_JPEG_QUALITY, CLAUDE_API.get("jpeg_quality", 90)])
+                media_type = "image/jpeg"
+            else:
+                _, buffer = cv2.imencode('.png', image)
+                media_type = "image/png"
+            return base64.standard_b64encode(buffer).decode("utf-8"), media_type
         raise ValueError("画像の変換に失敗しました")
 
+    @staticmethod
+    def _downscale_for_claude(image):
+        """長辺を max_image_side 以下に縮小（Claude側の縮小と同じ上限）"""
+        h, w = image.shape[:2]
+        scale = CLAUDE_API.get("max_image_side", 1568) / max(h, w)
+        if scale >= 1.0:
+            return image
+        return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    def _image_block(self, image, photo: bool = False) -> dict:
+        """画像のcontentブロック"""
+        b64, media_type = self._image_to_base64(image, photo=photo)
+        return {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": media_type,
+                "data": b64,
+            }
+        }
+
+    def _message_params(self, content: list) -> dict:
+        """リクエストパラメータ"""
+        return {
+            "model": CLAUDE_API["model"],
+            "max_tokens": CLAUDE_API["max_tokens"],
+            "temperature": CLAUDE_API["temperature"],
+            "messages": [{
+                "role": "user",
+                "content": content,
+            }]
+        }
+
+    def _create_message(self, content: list):
+        """APIを呼び出す（同時実行数を制限）"""
+        with self._request_slots:
+            return self.client.messages.create(**self._message_params(content))
+
     def recognize_field(self, image, field_name: str,
                         field_config: dict) -> Dict[str, Any]:
         """
@@ -70,34 +203,13 @@ class ClaudeOCR:
             return {"value": None, "confidence": "low",
                     "note": "Claude API未接続"}
 
-        description = field_config.get("description", field_name)
-        field_type = field_config.get("type", "unknown")
-        options = field_config.get("options", [])
-
-        prompt = self._build_field_prompt(field_name, description,
-                                          field_type, options)
+        prompt = self._build_field_prompt(field_name, field_config)
 
         try:
-            b64 = self._image_to_base64(image)
-            response = self.client.messages.create(
-                model=CLAUDE_API["model"],
-                max_tokens=CLAUDE_API["max_tokens"],
-                temperature=CLAUDE_API["temperature"],
-                messages=[{
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": "image/png",
-                                "data": b64,
-                            }
-                        },
-                        {"type": "text", "text": prompt}
-                    ]
-                }]
-            )
+            response = self._create_message([
+                self._image_block(image),
+                {"type": "text", "text": prompt},
+            ])
 
             text = response.content[0].text
             return self._parse_response(text)
@@ -106,12 +218,105 @@ class ClaudeOCR:
             print(f"  Claude API Error ({field_name}): {e}")
             return {"value": None, "confidence": "low", "error": str(e)}
 
-    def recognize_full_page(self, image) -> Dict[str, Any]:
+    def recognize_field_group(self, items: list) -> List[Dict[str, Any]]:
+        """
+        複数フィールドを1回のAPI呼び出しでOCR処理
+
+        Args:
+            items: (切り出し画像, フィールド名, フィールド設定) のリスト
+
+        Returns:
+            items と同じ順序の {"value": ..., "confidence": ...} のリスト
+        """
+        if len(items) == 1 or not self.is_available():
+            return [self.recognize_field(*item) for item in items]
+
+        content = []
+        descriptions = []
+        for i, (image, field_name, field_config) in enumerate(items, 1):
+            content.append({"type": "text", "text": f"画像{i}"})
+            content.append(self._image_block(image))
+            descriptions.append(
+                f"[画像{i}]\n{self._field_description(field_name, field_config)}")
+        content.append({"type": "text", "text": OCR_GROUP_PROMPT_TEMPLATE.format(
+            field_descriptions="\n".join(descriptions), count=len(items))})
+
+        try:
+            response = self._create_message(content)
+            results = self._parse_response(response.content[0].text)
+        except Exception as e:
+            print(f"  Claude API Error (field group): {e}")
+            results = None
+
+        if isinstance(results, list) and len(results) == len(items):
+            return results
+
+        # 件数が合わない・パース失敗時は個別に読み取り直す
+        return [self.recognize_field(*item) for item in items]
+
+    def recognize_fields_batch(self, rois: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        1ページ分の切り出し画像をまとめて1回のAPI呼び出しでOCR処理
+
+        Args:
+            rois: {フィールド名: 切り出し画像}（フィールド設定は RELATIVE_REGIONS から取得）
+
+        Returns:
+            {フィールド名: {"value": ..., "confidence": ...}}
+            応答に含まれない・形式が不正なフィールドのみ個別に読み取り直す
+        """
+        if not rois:
+            return {}
+        if not self.is_available():
+            return {name: self.recognize_field(image, name, RELATIVE_REGIONS.get(name, {}))
+                    for name, image in rois.items()}
+
+        content = []
+        descriptions = []
+        for name, image in rois.items():
+            content.append({"type": "text", "text": f"[{name}]"})
+            content.append(self._image_block(image))
+            descriptions.append(
+                f"[{name}]\n{self._field_description(name, RELATIVE_REGIONS.get(name, {}))}")
+        content.append({"type": "text", "text": OCR_FIELDS_PROMPT_TEMPLATE.format(
+            field_descriptions="\n".join(descriptions))})
+
+        try:
+            response = self._create_message(content)
+            parsed = self._parse_response(response.content[0].text)
+        except Exception as e:
+            print(f"  Claude API Error (fields batch): {e}")
+            parsed = {}
+
+        results = {}
+        for name, image in rois.items():
+            field_config = RELATIVE_REGIONS.get(name, {})
+            result = parsed.get(name) if isinstance(parsed, dict) else None
+            if self._is_valid_field_result(result, field_config):
+                results[name] = result
+            else:
+                results[name] = self.recognize_field(image, name, field_config)
+        return results
+
+    @staticmethod
+    def _is_valid_field_result(result, field_config: dict) -> bool:
+        """フィールド結果の形式チェック（選択肢がある場合は値が選択肢に含まれるか）"""
+        if not isinstance(result, dict) or "value" not in result:
+            return False
+        options = field_config.get("options")
+        value = result["value"]
+        if options and value is not None and not isinstance(value, bool):
+            return value in options
+        return True
+
+    def recognize_full_page(self, image,
+                            use_cache: Optional[bool] = None) -> Dict[str, Any]:
         """
         全ページ一括OCR処理（v2.1: QRコード回答フィールド追加）
 
         Args:
             image: 全ページ画像
+            use_cache: 同じ画像の結果キャッシュを使うか（省略時はインスタンスの設定）
 
         Returns:
             全フィールドのOCR結果辞書
@@ -120,39 +325,244 @@ class ClaudeOCR:
             return {}
 
         prompt = self._create_full_page_prompt()
+        if use_cache is None:
+            use_cache = self.use_cache
 
         try:
-            b64 = self._image_to_base64(image)
-            response = self.client.messages.create(
-                model=CLAUDE_API["model"],
-                max_tokens=CLAUDE_API["max_tokens"],
-                temperature=CLAUDE_API["temperature"],
-                messages=[{
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": "image/png",
-                                "data": b64,
-                            }
-                        },
-                        {"type": "text", "text": prompt}
-                    ]
-                }]
-            )
+            cache_path = None
+            if use_cache:
+                # モデル・プロンプトが変われば別キーになるよう合わせてハッシュ
+                cache_path = self._cache_path(image, prompt)
+                cached = self._read_cache(cache_path)
+                if cached is not None:
+                    return cached
+
+            response = self._create_message([
+                self._image_block(image, photo=True),
+                {"type": "text", "text": prompt},
+            ])
 
             text = response.content[0].text
-            return self._parse_full_page_response(text)
+            result = self._parse_response(text, fallback={})
+            if cache_path is not None and result:
+                self._write_cache(cache_path, result)
+            return result
 
         except Exception as e:
             print(f"  Claude API Error (full page): {e}")
             return {}
 
-    def _build_field_prompt(self, field_name: str, description: str,
-                            field_type: str, options: list) -> str:
+    @staticmethod
+    def _cache_key(image, prompt: str) -> str:
+        """画像内容＋モデル＋プロンプトのハッシュ"""
+        hasher = _new_hasher()
+        hasher.update(CLAUDE_API["model"].encode("utf-8"))
+        hasher.update(prompt.encode("utf-8"))
+        if isinstance(image, str):
+            with open(image, "rb") as f:
+                hasher.update(f.read())
+        else:
+            # 画素バッファをコピーせずにハッシュ（形状も含める）
+            hasher.update(repr(image.shape).encode("ascii"))
+            hasher.update(memoryview(image).cast("B") if image.flags.c_contiguous
+                          else image.tobytes())
+        return hasher.hexdigest()
+
+    @classmethod
+    def _cache_path(cls, image, prompt: str) -> Path:
+        """画像・プロンプトに対応するキャッシュファイルのパス"""
+        return CACHE_DIR / f"{cls._cache_key(image, prompt)}.json"
+
+    @staticmethod
+    def _read_cache(cache_path: Path) -> Optional[dict]:
+        """
+        キャッシュ済みの結果を読み込み（無ければ None）
+
+        壊れたファイルは削除して None を返す（キャッシュなしとして再取得させる）。
+        """
+        try:
+            with open(cache_path, "rb") as f:
+                result = json_loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"  Warning: OCRキャッシュを読み込めません（再取得します）: {cache_path.name}: {e}")
+            try:
+                cache_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return None
+        return result if isinstance(result, dict) else None
+
+    @staticmethod
+    def _write_cache(cache_path: Path, result: dict):
+        """キャッシュを一時ファイル経由で書き込み（途中状態のファイルを残さない）"""
+        os.makedirs(cache_path.parent, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent,
+                                        prefix=cache_path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def recognize_full_pages(self, images: list,
+                             max_workers: Optional[int] = None,
+                             names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        複数ページの全ページOCRを並列実行
+
+        API呼び出しはネットワーク待ちが大半のため、スレッドで同時に発行する。
+        anthropic.Anthropic クライアント（接続プール）は全スレッドで共有。
+        names を指定し、件数が batch_threshold 以上の場合は
+        Message Batches API で一括処理する（完了まで待機）。
+
+        Args:
+            images: 全ページ画像（np.ndarray or ファイルパス）のリスト
+            max_workers: スレッド数（省略時は max_concurrent_requests）
+            names: ページの識別名（PDFファイル名など。バッチの再開判定に使用）
+
+        Returns:
+            入力と同じ順序のOCR結果辞書のリスト
+        """
+        if not images:
+            return []
+
+        if (names is not None and self.is_available()
+                and len(images) >= CLAUDE_API.get("batch_threshold", 20)):
+            return self._recognize_full_pages_batch(images, names)
+
+        workers = min(max_workers or self.max_concurrent_requests, len(images))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.recognize_full_page, images))
+
+    def _recognize_full_pages_batch(self, images: list,
+                                    names: List[str]) -> List[Dict[str, Any]]:
+        """
+        Message Batches API 経由の全ページOCR
+
+        キャッシュ済みのページは送信せず、残りだけをバッチにする。
+        同じページ構成の未取得バッチがあれば再開する。
+        """
+        results = [{} for _ in images]
+
+        # キャッシュにあるページは結果をそのまま使う
+        cache_paths = [None] * len(images)
+        if self.use_cache:
+            prompt = self._create_full_page_prompt()
+            for i, image in enumerate(images):
+                cache_paths[i] = self._cache_path(image, prompt)
+                cached = self._read_cache(cache_paths[i])
+                if cached is not None:
+                    results[i] = cached
+
+        pending = [i for i, result in enumerate(results) if not result]
+        if not pending:
+            return results
+        if len(pending) < len(images):
+            print(f"  キャッシュ済み: {len(images) - len(pending)}件 / バッチ送信対象: {len(pending)}件")
+
+        pending_images = [images[i] for i in pending]
+        pending_names = [names[i] for i in pending]
+
+        batch_id = None
+        if BATCH_STATE_PATH.exists():
+            with open(BATCH_STATE_PATH, "rb") as f:
+                state = json_loads(f.read())
+            if state.get("names") == pending_names:
+                batch_id = state["batch_id"]
+                print(f"  送信済みバッチを再開: {batch_id}")
+
+        if batch_id is None:
+            batch_id = self.submit_batch(pending_images, pending_names)
+
+        # バッチ内の番号は送信したページだけの並び
+        for batch_index, result in self.poll_batch(batch_id):
+            index = pending[batch_index]
+            results[index] = result
+            if cache_paths[index] is not None and result:
+                self._write_cache(cache_paths[index], result)
+
+        BATCH_STATE_PATH.unlink(missing_ok=True)
+        return results
+
+    def submit_batch(self, images: list, names: Optional[List[str]] = None) -> str:
+        """
+        全ページOCRを Message Batches API に一括送信
+
+        Args:
+            images: 全ページ画像のリスト
+            names: ページの識別名（再開判定用に batch_id と共に保存）
+
+        Returns:
+            batch_id
+        """
+        prompt = self._create_full_page_prompt()
+        # custom_id は英数字のみ使えるため、ファイル名ではなく入力順の番号を使う
+        requests = [
+            {
+                "custom_id": f"page-{i:05d}",
+                "params": self._message_params([
+                    self._image_block(image, photo=True),
+                    {"type": "text", "text": prompt},
+                ]),
+            }
+            for i, image in enumerate(images)
+        ]
+        batch = self.client.messages.batches.create(requests=requests)
+
+        os.makedirs(BATCH_STATE_PATH.parent, exist_ok=True)
+        with open(BATCH_STATE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"batch_id": batch.id,
+                       "names": list(names) if names is not None else None},
+                      f, ensure_ascii=False, indent=2)
+
+        print(f"  バッチ送信: {batch.id} ({len(requests)}件)")
+        return batch.id
+
+    def poll_batch(self, batch_id: str, interval: Optional[float] = None):
+        """
+        バッチの完了を待ち、結果を順次返す
+
+        Args:
+            batch_id: submit_batch の戻り値
+            interval: 状況確認の間隔(秒)
+
+        Yields:
+            (入力順の番号, OCR結果辞書)
+        """
+        interval = interval or CLAUDE_API.get("batch_poll_interval", 30)
+        while True:
+            batch = self.client.messages.batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                break
+            counts = batch.request_counts
+            print(f"  バッチ処理中: {batch_id} (完了 {counts.succeeded}件 / 処理中 {counts.processing}件)")
+            time.sleep(interval)
+
+        for entry in self.client.messages.batches.results(batch_id):
+            index = int(entry.custom_id.split("-", 1)[1])
+            if entry.result.type == "succeeded":
+                text = entry.result.message.content[0].text
+                yield index, self._parse_response(text, fallback={})
+            else:
+                print(f"  Claude API Error (batch {entry.custom_id}): {entry.result.type}")
+                yield index, {}
+
+    def _build_field_prompt(self, field_name: str, field_config: dict) -> str:
         """個別フィールド用プロンプト構築"""
+        field_desc = self._field_description(field_name, field_config)
+        return OCR_PROMPT_TEMPLATE.format(field_description=field_desc)
+
+    def _field_description(self, field_name: str, field_config: dict) -> str:
+        """プロンプトに埋め込むフィールドの説明"""
+        description = field_config.get("description", field_name)
+        field_type = field_config.get("type", "unknown")
+        options = field_config.get("options", [])
+
         field_desc = f"フィールド: {field_name}\n説明: {description}\n"
         field_desc += f"データタイプ: {field_type}\n"
 
@@ -163,7 +573,7 @@ class ClaudeOCR:
             field_desc += "注意: チェックマーク（✓）や黒塗り（■）があるかどうかを判定してください。\n"
             field_desc += "チェックがあれば true、なければ false で回答してください。\n"
 
-        return OCR_PROMPT_TEMPLATE.format(field_description=field_desc)
+        return field_desc
 
     def _create_full_page_prompt(self) -> str:
         """
@@ -225,28 +635,105 @@ class ClaudeOCR:
 JSONのみを出力してください（説明文は不要）。
 """
 
-    def _parse_response(self, text: str) -> Dict[str, Any]:
-        """Claude APIレスポンスをパース"""
+    def _parse_response(self, text: str, fallback: Optional[Any] = None) -> Any:
+        """
+        Claude APIレスポンス（JSON。```で囲まれていてもよい）をパース
+
+        Args:
+            text: レスポンス本文
+            fallback: パース失敗時の戻り値
+                      （省略時は本文を value にした低信頼度のフィールド結果）
+        """
+        # 純粋なJSONならそのままパース（余分な文字列のコピーを作らない）
+        try:
+            return json_loads(text)
+        except ValueError:
+            pass
+
+        # JSON部分を抽出
+        body = text.strip()
+        if body.startswith("```"):
+            body = body.split("\n", 1)[1] if "\n" in body else ""
+            body = body.rsplit("```", 1)[0]
         try:
-            # JSON部分を抽出
-            text = text.strip()
-            if text.startswith("```"):
-                text = text.split("\n", 1)[1]
-                text = text.rsplit("```", 1)[0]
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return json_loads(body)
+        except ValueError:
+            if fallback is not None:
+                print("  Warning: JSONパース失敗")
+                return fallback
             return {"value": text.strip(), "confidence": "low",
                     "raw_response": text}
 
-    def _parse_full_page_response(self, text: str) -> Dict[str, Any]:
-        """全ページレスポンスをパース"""
+
+class BatchingQueue:
+    """
+    個別フィールドOCRの要求をまとめて送信する待ち行列
+
+    複数スレッドから enqueue された要求を、最初の1件から最大 max_delay_ms
+    待って集め、最大 max_batch_size 件ずつ1回のAPI呼び出しで処理する。
+    """
+
+    def __init__(self, ocr: ClaudeOCR, max_batch_size: int = 8,
+                 max_delay_ms: float = 50):
+        self.ocr = ocr
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def enqueue(self, image, field_name: str, field_config: dict) -> Future:
+        """
+        フィールドOCRを予約
+
+        Returns:
+            結果（recognize_field と同じ辞書）を受け取る Future
+        """
+        future = Future()
+        self._queue.put((image, field_name, field_config, future))
+        return future
+
+    def close(self):
+        """投入済みの要求を処理し終えてから停止"""
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self):
+        """受付スレッド: 要求を集めてまとめて送信"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch: list):
+        """まとめた要求を送信し、各 Future に結果を返す"""
+        futures = [item[3] for item in batch]
         try:
-            text = text.strip()
-            if text.startswith("```"):
-                lines = text.split("\n")
-                text = "\n".join(lines[1:])
-                text = text.rsplit("```", 1)[0]
-            return json.loads(text)
-        except json.JSONDecodeError:
-            print(f"  Warning: JSONパース失敗")
-            return {}
+            results = self.ocr.recognize_field_group([item[:3] for item in batch])
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        for future, result in zip(futures, results):
+            future.set_result(result)
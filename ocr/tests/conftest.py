@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# ocr/ のスクリプトはフラットなモジュールとして互いに import している
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
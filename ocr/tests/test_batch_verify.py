@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("fitz")
+batch_verify = pytest.importorskip("batch_verify")
+
+
+def _success_result(**overrides):
+    result = {
+        "index": 0,
+        "filename": "a.pdf",
+        "filepath": "Scan Data/a.pdf",
+        "folder": "batch_data/a",
+        "images": {"質問1_氏": {"x": 0, "y": 0, "w": 10, "h": 10}},
+        "sprite_sheet": {"path": "batch_data/a/sheet.jpg",
+                         "width": np.int64(10), "height": np.int64(10)},
+        "skew_angle": np.float64(0.25),
+        "scan_image": "batch_data/a/scan.jpg",
+        "version": 1,
+        "ocr_results": {"質問2_QRコード回答": np.bool_(True)},
+        "verified": False,
+        "status": "success",
+    }
+    result.update(overrides)
+    return result
+
+
+@pytest.mark.parametrize("indent", [False, True])
+def test_json_dumps_numpy_scalars(indent):
+    data = json.loads(batch_verify.json_dumps(
+        {"angle": np.float64(1.5), "checked": np.bool_(True), "n": np.int32(3)},
+        indent=indent,
+    ))
+    assert data == {"angle": 1.5, "checked": True, "n": 3}
+
+
+def test_json_dumps_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        batch_verify.json_dumps({"x": object()})
+
+
+def test_write_manifest_numpy_values(tmp_path, monkeypatch):
+    manifest_path = tmp_path / "manifest.json"
+    monkeypatch.setattr(batch_verify, "MANIFEST_PATH", manifest_path)
+
+    batch_verify.write_manifest([_success_result()])
+
+    entries = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert entries[0]["skew_angle"] == 0.25
+    assert entries[0]["ocr_results"] == {"質問2_QRコード回答": True}
+    assert entries[0]["sprite_sheet"]["width"] == 10
+
+
+def test_write_json_atomic_leaves_no_partial_file(tmp_path):
+    save_path = tmp_path / "cache.json"
+
+    with pytest.raises(TypeError):
+        batch_verify.write_json_atomic(save_path, {"x": object()}, indent=False)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_json_atomic_keeps_previous_file_on_failure(tmp_path):
+    save_path = tmp_path / "cache.json"
+    batch_verify.write_json_atomic(save_path, {"status": "success"}, indent=False)
+
+    with pytest.raises(TypeError):
+        batch_verify.write_json_atomic(save_path, {"x": object()}, indent=False)
+
+    assert json.loads(save_path.read_bytes()) == {"status": "success"}
+    assert list(tmp_path.iterdir()) == [save_path]
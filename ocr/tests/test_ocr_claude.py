@@ -0,0 +1,101 @@
+import types
+
+import pytest
+
+import ocr_claude
+
+
+class FakeBatches:
+    def __init__(self, calls):
+        self.calls = calls
+        self.count = 0
+
+    def create(self, requests):
+        self.calls.append(("batch", len(requests)))
+        self.count = len(requests)
+        return types.SimpleNamespace(id="batch-1")
+
+    def retrieve(self, batch_id):
+        return types.SimpleNamespace(processing_status="ended")
+
+    def results(self, batch_id):
+        for i in range(self.count):
+            message = types.SimpleNamespace(
+                content=[types.SimpleNamespace(text='{"患者ID": {"value": "batch"}}')])
+            yield types.SimpleNamespace(
+                custom_id=f"page-{i:05d}",
+                result=types.SimpleNamespace(type="succeeded", message=message))
+
+
+class FakeOCR(ocr_claude.ClaudeOCR):
+    """API呼び出しを記録するだけの ClaudeOCR"""
+
+    def __init__(self):
+        super().__init__(api_key="test-key")
+        self.calls = []
+        self.client = types.SimpleNamespace(
+            messages=types.SimpleNamespace(batches=FakeBatches(self.calls)))
+
+    def is_available(self):
+        return True
+
+    def _image_block(self, image, photo=False):
+        return {"type": "image"}
+
+    def _create_message(self, content):
+        self.calls.append(("message", 1))
+        return types.SimpleNamespace(
+            content=[types.SimpleNamespace(text='{"患者ID": {"value": "single"}}')])
+
+
+@pytest.fixture
+def cache_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(ocr_claude, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(ocr_claude, "BATCH_STATE_PATH", tmp_path / "batch.json")
+    return tmp_path
+
+
+def _page_files(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"page{i}.png"
+        path.write_bytes(b"page-%d" % i)
+        paths.append(str(path))
+    return paths
+
+
+def _corrupt_cache(ocr, image):
+    cache_path = ocr._cache_path(image, ocr._create_full_page_prompt())
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_bytes('{"患者ID": {"val'.encode("utf-8"))
+    return cache_path
+
+
+def test_corrupt_cache_is_refetched_single_page(cache_dirs):
+    ocr = FakeOCR()
+    [image] = _page_files(cache_dirs, 1)
+    cache_path = _corrupt_cache(ocr, image)
+
+    result = ocr.recognize_full_page(image)
+
+    assert result == {"患者ID": {"value": "single"}}
+    assert ocr.calls == [("message", 1)]
+    # 壊れたキャッシュは取り直した結果で置き換わる
+    assert ocr._read_cache(cache_path) == result
+
+
+def test_corrupt_cache_is_refetched_batch(cache_dirs):
+    threshold = ocr_claude.CLAUDE_API.get("batch_threshold", 20)
+    ocr = FakeOCR()
+    images = _page_files(cache_dirs, threshold)
+    cache_path = _corrupt_cache(ocr, images[0])
+
+    results = ocr.recognize_full_pages(images, names=[f"p{i}" for i in range(len(images))])
+
+    assert ocr.calls == [("batch", len(images))]
+    assert results[0] == {"患者ID": {"value": "batch"}}
+    assert ocr._read_cache(cache_path) == results[0]
+
+
+def test_read_cache_missing_file(cache_dirs):
+    assert ocr_claude.ClaudeOCR._read_cache(cache_dirs / "missing.json") is None
@@ -15,7 +15,10 @@ import sys
 import json
 import glob
 import math
-import base64
+import functools
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
 
@@ -28,6 +31,24 @@ except ImportError:
     HAS_CV2 = False
     print("Warning: opencv-python がインストールされていません")
 
+# Base64変換（pybase64があればSIMD実装の高速版を使用）
+try:
+    import pybase64 as base64
+    HAS_PYBASE64 = True
+except ImportError:
+    import base64
+    HAS_PYBASE64 = False
+
+# HTMLテンプレート
+try:
+    from jinja2 import (
+        Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape,
+    )
+    HAS_JINJA2 = True
+except ImportError:
+    HAS_JINJA2 = False
+    print("Warning: Jinja2 がインストールされていません")
+
 # PDF処理
 try:
     import fitz  # PyMuPDF
@@ -36,42 +57,103 @@ except ImportError:
     HAS_FITZ = False
     print("Warning: PyMuPDF がインストールされていません")
 
-# PIL
-try:
-    from PIL import Image
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
-
 from config import (
     RELATIVE_REGIONS, ANCHOR_POINTS, PATHS,
     INSTITUTION_MASTER, VALIDATION_RULES, REVIEW_GROUPS,
-    CLAUDE_API, OCR_PROMPT_TEMPLATE,
+    CLAUDE_API, OCR_PROMPT_TEMPLATE, PDF_DPI,
 )
 
+# 照合HTMLのテンプレート
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+VERIFICATION_TEMPLATE_NAME = "verification.html"
+# コンパイル済みテンプレートのバイトコード置き場（プロセスを跨いで再利用）
+TEMPLATE_CACHE_DIR = Path(__file__).parent / PATHS["template_cache"]
+
+# PNG書き出し・エンコードの並列数（cv2.imencode はGILを解放する）
+IMAGE_IO_WORKERS = os.cpu_count() or 4
+
+# 質問2セクションの見出しに表示する行全体画像
+Q2_ROW_REGION = "質問2_行全体"
+
+# HTML埋め込み時に JPEG にする大きな画像（全体画像は常に JPEG）
+JPEG_EMBED_REGIONS = {Q2_ROW_REGION}
+EMBED_JPEG_QUALITY = 80
+
+# ヘッダーに表示する全体画像サムネイルの幅(px)。表示は200px幅なので高DPI表示を見込んで2倍
+THUMBNAIL_WIDTH = 400
+THUMBNAIL_FILENAME = "full_page_thumb.jpg"
+
+# 傾き検出に使う縮小画像の幅(px)。300DPIの原寸ではエッジ・線分が多すぎる
+SKEW_DETECT_WIDTH = 800
+
 
 # ============================================
 # PDF → 画像変換
 # ============================================
 
-def pdf_to_image(pdf_path: str, dpi: int = 300) -> Optional[np.ndarray]:
-    """PDFの1ページ目を画像に変換"""
+def _render_page(page, dpi: int, clip=None) -> np.ndarray:
+    """PDFページ（clip指定時はその範囲のみ）をBGR画像に描画"""
+    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    # アルファなしのRGBで直接描画（RGBAバッファ分のメモリと変換を省く）
+    pix = page.get_pixmap(matrix=mat, clip=clip, colorspace=fitz.csRGB, alpha=False)
+
+    # samples_mv はピクスマップのバッファを直接参照する（samples はbytesへのコピー）
+    # pix はcvtColorでBGRの新しい配列を作り終えるまで保持する
+    rgb = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.h, pix.w, pix.n)
+    img = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+    del rgb, pix
+    return img
+
+
+def pdf_to_image(pdf_path: str, dpi: Optional[int] = None) -> Optional[np.ndarray]:
+    """
+    PDFの1ページ目を画像に変換
+
+    Args:
+        dpi: 描画解像度（省略時は PDF_DPI["page"]。全ページOCR用なら PDF_DPI["full_page_ocr"]）
+    """
     if not HAS_FITZ:
         print("Error: PyMuPDFが必要です。pip install PyMuPDF")
         return None
 
     doc = fitz.open(pdf_path)
-    page = doc.load_page(0)
-    mat = fitz.Matrix(dpi / 72, dpi / 72)
-    pix = page.get_pixmap(matrix=mat)
-
-    img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.h, pix.w, pix.n)
-    if pix.n == 4:
-        img = cv2.cvtColor(img, cv2.COLOR_RGBA2BGR)
-    elif pix.n == 3:
-        img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-    doc.close()
-    return img
+    try:
+        return _render_page(doc.load_page(0), dpi or PDF_DPI["page"])
+    finally:
+        doc.close()
+
+
+def pdf_to_region(pdf_path: str, region_rel: dict,
+                  dpi: Optional[int] = None) -> Optional[np.ndarray]:
+    """
+    PDFの1ページ目の指定領域だけを高解像度で描画
+
+    ページ全体をラスタライズせず、clipで指定範囲のみ描画する。
+    傾斜補正は行わないため、小さな手書き領域の読み直し用。
+
+    Args:
+        region_rel: 相対座標 {"x", "y", "width", "height"}（RELATIVE_REGIONSの値）
+        dpi: 描画解像度（省略時は PDF_DPI["region"]）
+    """
+    if not HAS_FITZ:
+        print("Error: PyMuPDFが必要です。pip install PyMuPDF")
+        return None
+
+    doc = fitz.open(pdf_path)
+    try:
+        page = doc.load_page(0)
+        rect = page.rect
+        clip = fitz.Rect(
+            rect.x0 + region_rel["x"] * rect.width,
+            rect.y0 + region_rel["y"] * rect.height,
+            rect.x0 + (region_rel["x"] + region_rel["width"]) * rect.width,
+            rect.y0 + (region_rel["y"] + region_rel["height"]) * rect.height,
+        ) & rect
+        if clip.is_empty:
+            return None
+        return _render_page(page, dpi or PDF_DPI["region"], clip=clip)
+    finally:
+        doc.close()
 
 
 def load_image(file_path: str) -> Optional[np.ndarray]:
@@ -87,36 +169,54 @@ def load_image(file_path: str) -> Optional[np.ndarray]:
 # 傾斜補正（2点参照方式）
 # ============================================
 
-def detect_skew_angle(gray: np.ndarray) -> float:
+def _shrink_for_skew(image: np.ndarray) -> Tuple[np.ndarray, float]:
+    """傾き検出用に幅 SKEW_DETECT_WIDTH まで縮小（縮小画像, 縮小率）"""
+    h, w = image.shape[:2]
+    scale = min(1.0, SKEW_DETECT_WIDTH / w)
+    if scale < 1.0:
+        image = cv2.resize(image, (SKEW_DETECT_WIDTH, int(h * scale)),
+                           interpolation=cv2.INTER_AREA)
+    return image, scale
+
+
+def detect_skew_angle(gray: np.ndarray, scale: float = 1.0) -> float:
     """
     2点参照方式による傾き検出
     質問1と質問15の「質問」文字位置を基準点として使用
+
+    Args:
+        gray: グレー画像
+        scale: gray が原寸から縮小済みの場合の縮小率
     """
+    # 線分検出は縮小画像で行う（角度は縮小しても変わらない）
+    gray, shrink = _shrink_for_skew(gray)
+    scale *= shrink
+
     edges = cv2.Canny(gray, 50, 150, apertureSize=3)
-    lines = cv2.HoughLinesP(edges, 1, np.pi / 180, 100,
-                            minLineLength=200, maxLineGap=10)
+    lines = cv2.HoughLinesP(edges, 1, np.pi / 180, max(int(100 * scale), 20),
+                            minLineLength=max(int(200 * scale), 40), maxLineGap=10)
 
     if lines is None:
         return 0.0
 
     # 水平に近い線の角度を収集
-    angles = []
-    for line in lines:
-        x1, y1, x2, y2 = line[0]
-        angle = math.degrees(math.atan2(y2 - y1, x2 - x1))
-        if abs(angle) < 10:  # ±10度以内の水平線のみ
-            angles.append(angle)
-
-    if not angles:
+    dx = lines[:, 0, 2] - lines[:, 0, 0]
+    dy = lines[:, 0, 3] - lines[:, 0, 1]
+    angles = np.degrees(np.arctan2(dy, dx))
+    angles = angles[np.abs(angles) < 10]  # ±10度以内の水平線のみ
+
+    if not angles.size:
         return 0.0
 
-    return np.median(angles)
+    return float(np.median(angles))
 
 
 def correct_skew(image: np.ndarray) -> np.ndarray:
     """傾斜補正を適用"""
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-    angle = detect_skew_angle(gray)
+    # 先に縮小してからグレー化（原寸のグレー画像を作らない）
+    small, scale = _shrink_for_skew(image)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if len(small.shape) == 3 else small
+    angle = detect_skew_angle(gray, scale)
 
     if abs(angle) < 0.1:
         return image
@@ -135,6 +235,17 @@ def correct_skew(image: np.ndarray) -> np.ndarray:
 # 領域切り出し
 # ============================================
 
+# ページ全体の前処理結果（グレー化・二値化はページごとに1回だけ行う）
+PagePreprocessed = namedtuple('PagePreprocessed', 'bgr gray binary')
+
+
+def preprocess_page(image: np.ndarray) -> PagePreprocessed:
+    """ページ全体をグレー化し、Otsuで二値化（黒=255）"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    return PagePreprocessed(image, gray, binary)
+
+
 def extract_region(image: np.ndarray, region: dict) -> np.ndarray:
     """相対座標から画像領域を切り出す"""
     h, w = image.shape[:2]
@@ -152,16 +263,38 @@ def extract_region(image: np.ndarray, region: dict) -> np.ndarray:
     return image[y:y + rh, x:x + rw]
 
 
+# 全領域の相対座標 (x, y, width, height) を配列化（切り出し範囲を一括計算するため）
+_REGION_NAMES = list(RELATIVE_REGIONS)
+_REGION_ARR = np.array(
+    [[r["x"], r["y"], r["width"], r["height"]] for r in RELATIVE_REGIONS.values()],
+    dtype=np.float64,
+)
+
+
+# 切り出し画像の保存ファイル名（領域名のパス区切りを置換）
+REGION_FILENAMES = {
+    name: name.replace("/", "_").replace("\\", "_") + ".png"
+    for name in RELATIVE_REGIONS
+}
+
+
 def extract_all_regions(image: np.ndarray) -> Dict[str, np.ndarray]:
-    """全領域を切り出し"""
+    """全領域を切り出し（元画像のビューを返す。PagePreprocessed の各画像にも使用可）"""
+    h, w = image.shape[:2]
+    bounds = (_REGION_ARR * np.array([w, h, w, h])).astype(np.int32)
+
+    # 画像境界チェック（extract_region と同じ規則）
+    xs = np.clip(bounds[:, 0], 0, w - 1)
+    ys = np.clip(bounds[:, 1], 0, h - 1)
+    x_ends = xs + np.minimum(bounds[:, 2], w - xs)
+    y_ends = ys + np.minimum(bounds[:, 3], h - ys)
+
     regions = {}
-    for name, region in RELATIVE_REGIONS.items():
-        try:
-            roi = extract_region(image, region)
-            if roi.size > 0:
-                regions[name] = roi
-        except Exception as e:
-            print(f"  Warning: {name} 切り出し失敗 - {e}")
+    for name, x, y, x_end, y_end in zip(_REGION_NAMES, xs.tolist(), ys.tolist(),
+                                        x_ends.tolist(), y_ends.tolist()):
+        roi = image[y:y_end, x:x_end]
+        if roi.size > 0:
+            regions[name] = roi
     return regions
 
 
@@ -169,62 +302,118 @@ def extract_all_regions(image: np.ndarray) -> Dict[str, np.ndarray]:
 # チェックボックス検出
 # ============================================
 
-def detect_checkbox(roi: np.ndarray, threshold: float = 0.25) -> bool:
+def detect_checkbox(binary: np.ndarray, threshold: float = 0.25) -> bool:
     """
     チェックボックスの塗りつぶし/チェックマーク検出
     黒ピクセル比率で判定
+
+    Args:
+        binary: 二値化済みのページ（PagePreprocessed.binary）から切り出した領域
     """
-    if roi.size == 0:
+    if binary.size == 0:
         return False
 
-    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if len(roi.shape) == 3 else roi
-    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
-
-    black_ratio = np.sum(binary > 0) / binary.size
+    black_ratio = np.count_nonzero(binary) / binary.size
     return black_ratio > threshold
 
 
-def detect_filled_box(roi: np.ndarray, options: list,
+def detect_filled_box(binary: np.ndarray, options: list,
                       threshold: float = 0.15) -> Optional[str]:
     """
     複数選択肢の黒塗りチェックボックス検出
     各選択肢領域を均等分割し、黒ピクセル比率が最大のものを返す
+
+    Args:
+        binary: 二値化済みのページ（PagePreprocessed.binary）から切り出した領域
     """
-    if roi.size == 0 or not options:
-        return None
+    return detect_filled_boxes(binary[np.newaxis], options, threshold)[0]
 
-    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if len(roi.shape) == 3 else roi
-    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
 
-    h, w = binary.shape
+def detect_filled_boxes(binaries: np.ndarray, options: list,
+                        threshold: float = 0.15) -> List[Optional[str]]:
+    """
+    同じ形状・同じ選択肢数の領域 (N, h, w) をまとめて detect_filled_box と同じ規則で判定
+
+    Returns:
+        領域ごとの選択結果（選択なしは None）
+    """
+    count = len(binaries)
+    if binaries.size == 0 or not options:
+        return [None] * count
+
+    _, h, w = binaries.shape
     n = len(options)
     option_width = w // n
 
-    max_ratio = 0
-    selected = None
+    # チェックボックス部分（各選択肢の左側の一部）を重点的に見る
+    checkbox_width = min(35, option_width // 4)
+    if checkbox_width == 0:
+        return [None] * count
+
+    # 選択肢ごとに (N, h, n, option_width) へ並べ替え、左端だけを一括で集計
+    cells = binaries[:, :, :n * option_width].reshape(count, h, n, option_width)
+    checkboxes = cells[:, :, :, :checkbox_width]
+    ratios = np.count_nonzero(checkboxes, axis=(1, 3)) / (h * checkbox_width)
 
-    for i, option in enumerate(options):
-        x_start = i * option_width
-        x_end = min(x_start + option_width, w)
-        option_roi = binary[:, x_start:x_end]
+    best = ratios.argmax(axis=1)
+    return [
+        options[b] if ratios[i, b] > threshold else None
+        for i, b in enumerate(best.tolist())
+    ]
 
-        # チェックボックス部分（左側の一部）を重点的に見る
-        checkbox_width = min(35, option_width // 4)
-        checkbox = option_roi[:, :checkbox_width]
-        black_ratio = np.sum(checkbox > 0) / checkbox.size
 
-        if black_ratio > max_ratio and black_ratio > threshold:
-            max_ratio = black_ratio
-            selected = option
+# ============================================
+# OCR結果
+# ============================================
 
-    return selected
+@dataclass(frozen=True)
+class OcrResult:
+    """1フィールド分のOCR/チェックボックス検出結果（不変。複数フィールドで共有してよい）"""
+    value: Any = None
+    confidence: str = "low"
+    note: Optional[str] = None
+    raw_type: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON保存用の辞書（未設定の note / raw_type は出力しない）"""
+        d = {"value": self.value, "confidence": self.confidence}
+        if self.note is not None:
+            d["note"] = self.note
+        if self.raw_type is not None:
+            d["raw_type"] = self.raw_type
+        return d
+
+
+# 結果が無いフィールドの参照用（共有インスタンス）
+EMPTY_RESULT = OcrResult()
+
+# 手書き文字・数値など、画像処理では判定しないフィールドの結果（共有インスタンス）
+MANUAL_RESULT = OcrResult(note="Claude APIまたは手動入力が必要")
+
+# 画像処理で判定するフィールドの種類（どちらも選択肢ごとの黒塗り判定）
+DETECT_FIELD_TYPES = ("checkbox_single", "filled_box")
+
+# 選択肢を持たない単一チェックボックスとして判定するフィールドと、その閾値
+SINGLE_CHECKBOX_THRESHOLDS = {
+    "質問2_QRコード回答": 0.20,  # v2.1: QRコード回答チェックボックス
+}
+
+# OCR対象のフィールドを、画像処理で判定するものと手動入力のものに分けておく
+DETECT_REGIONS = {
+    name: cfg for name, cfg in RELATIVE_REGIONS.items()
+    if not cfg.get("review_only") and cfg.get("type", "") in DETECT_FIELD_TYPES
+}
+MANUAL_REGIONS = [
+    name for name, cfg in RELATIVE_REGIONS.items()
+    if not cfg.get("review_only") and name not in DETECT_REGIONS
+]
 
 
 # ============================================
 # v2.1新規: 質問2バリデーション
 # ============================================
 
-def validate_q2_consistency(ocr_results: Dict[str, Any]) -> Dict[str, Any]:
+def validate_q2_consistency(ocr_results: Dict[str, OcrResult]) -> Dict[str, Any]:
     """
     質問2の矛盾検出
     「QRコードで回答」チェック有の場合、生年月日欄が空欄であることを確認
@@ -237,7 +426,7 @@ def validate_q2_consistency(ocr_results: Dict[str, Any]) -> Dict[str, Any]:
             "details": dict
         }
     """
-    qr_checked = ocr_results.get("質問2_QRコード回答", {}).get("value", False)
+    qr_checked = ocr_results.get("質問2_QRコード回答", EMPTY_RESULT).value
 
     if not qr_checked:
         return {"has_warning": False, "message": "", "severity": "none", "details": {}}
@@ -247,7 +436,7 @@ def validate_q2_consistency(ocr_results: Dict[str, Any]) -> Dict[str, Any]:
     filled_fields = []
 
     for field in birthdate_fields:
-        value = ocr_results.get(field, {}).get("value")
+        value = ocr_results.get(field, EMPTY_RESULT).value
         if value is not None and str(value).strip():
             filled_fields.append(field)
 
@@ -271,114 +460,206 @@ def validate_q2_consistency(ocr_results: Dict[str, Any]) -> Dict[str, Any]:
 # 画像 → Base64変換（HTML埋め込み用）
 # ============================================
 
-def image_to_base64(image: np.ndarray) -> str:
-    """OpenCV画像をBase64エンコード"""
-    _, buffer = cv2.imencode('.png', image)
-    return base64.b64encode(buffer).decode('utf-8')
+def image_to_base64(image: np.ndarray, ext: str = ".png") -> str:
+    """
+    OpenCV画像をBase64エンコード
+
+    HTML埋め込み用なので PNG は最速の圧縮設定、".jpg" は EMBED_JPEG_QUALITY で保存する。
+    """
+    if ext == ".jpg":
+        params = [cv2.IMWRITE_JPEG_QUALITY, EMBED_JPEG_QUALITY]
+    else:
+        params = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+    _, buffer = cv2.imencode(ext, image, params)
+    return base64.b64encode(buffer).decode('ascii')
+
+
+def write_image(path: str, image: np.ndarray, params: Optional[list] = None) -> bool:
+    """
+    画像をファイルに保存
+
+    cv2.imwrite は Windows で日本語を含むパスに書けないため、imencode + open で書き出す。
+
+    Returns:
+        保存できたら True
+    """
+    ok, buffer = cv2.imencode(os.path.splitext(path)[1], image, params or [])
+    if not ok:
+        return False
+    try:
+        with open(path, 'wb') as f:
+            f.write(buffer.tobytes())
+    except OSError:
+        return False
+    return True
+
+
+def make_thumbnail(image: np.ndarray, width: int = THUMBNAIL_WIDTH) -> np.ndarray:
+    """幅 width に縮小したサムネイルを作成（元が小さければそのまま）"""
+    h, w = image.shape[:2]
+    if w <= width:
+        return image
+    return cv2.resize(image, (width, int(round(width * h / w))),
+                      interpolation=cv2.INTER_AREA)
+
+
+def _data_uri(b64: str, ext: str = ".png") -> str:
+    """Base64画像を img src 用の data URI に変換"""
+    media_type = "image/jpeg" if ext == ".jpg" else "image/png"
+    return f"data:{media_type};base64,{b64}"
 
 
 # ============================================
 # 照合用HTML生成
 # ============================================
 
+@functools.lru_cache(maxsize=1)
+def _get_template():
+    """
+    照合HTMLのコンパイル済みテンプレートを取得（初回のみ読み込み）
+
+    バイトコードは TEMPLATE_CACHE_DIR に保存され、テンプレートの内容が変わらない限り
+    次回以降の起動でもコンパイルを省略する。実行中の再読み込みはしない。
+    """
+    if not HAS_JINJA2:
+        raise RuntimeError("Jinja2が必要です。pip install Jinja2")
+    TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    env = Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=select_autoescape(["html"]),
+        bytecode_cache=FileSystemBytecodeCache(str(TEMPLATE_CACHE_DIR)),
+        cache_size=-1,
+        auto_reload=False,
+    )
+    return env.get_template(VERIFICATION_TEMPLATE_NAME)
+
+
 def generate_verification_html(
     regions: Dict[str, np.ndarray],
-    ocr_results: Dict[str, Any],
+    ocr_results: Dict[str, OcrResult],
     full_page_image: np.ndarray,
     validation_results: Dict[str, Any],
-    output_path: str
+    output_path: str,
+    region_paths: Optional[Dict[str, str]] = None,
+    full_page_path: Optional[str] = None,
+    embed_images: bool = False,
 ) -> str:
-    """照合用HTMLを生成（v2.1: 質問2行全体表示+矛盾検出対応）"""
+    """
+    照合用HTMLを生成（v2.1: 質問2行全体表示+矛盾検出対応）
 
-    # 各切り出し画像をBase64に変換
-    image_data = {}
-    for name, roi in regions.items():
-        image_data[name] = image_to_base64(roi)
+    region_paths / full_page_path が渡されていれば保存済みPNGを相対パスで参照する。
+    保存できていない画像と、embed_images=True（HTML単体で持ち運ぶ場合）はBase64埋め込みにする。
+    """
+    html_dir = os.path.dirname(output_path) or "."
 
-    # 全体画像
-    full_page_b64 = image_to_base64(full_page_image)
+    def rel(path: str) -> str:
+        return Path(os.path.relpath(path, html_dir)).as_posix()
+
+    def versioned(path: str) -> str:
+        # 更新時刻をクエリに付け、再生成までブラウザのキャッシュを効かせる
+        try:
+            return f"{rel(path)}?v={os.stat(path).st_mtime_ns}"
+        except OSError:
+            return rel(path)
+
+    # 表示しない領域（review_only や質問2の個別フィールド）の画像は扱わない
+    regions = {name: roi for name, roi in regions.items() if name in DISPLAYED_REGIONS}
+
+    # 参照できる保存済み画像（書き出せなかったものは埋め込みに回す）
+    linked_paths = {}
+    if not embed_images and region_paths is not None:
+        linked_paths = {name: path for name, path in region_paths.items()
+                        if os.path.isfile(path)}
+    full_page_linked = (not embed_images and full_page_path is not None
+                        and os.path.isfile(full_page_path))
+
+    # ヘッダーには縮小版だけを載せ、クリックで原寸の full_page_path を開く
+    thumbnail = make_thumbnail(full_page_image)
+    thumbnail_src = None
+    if full_page_linked:
+        thumbnail_path = os.path.join(html_dir, THUMBNAIL_FILENAME)
+        os.makedirs(html_dir, exist_ok=True)
+        if write_image(thumbnail_path, thumbnail,
+                       [cv2.IMWRITE_JPEG_QUALITY, EMBED_JPEG_QUALITY]):
+            thumbnail_src = versioned(thumbnail_path)
+
+    # 小さな切り出しは PNG、全体画像と行全体画像は JPEG
+    def ext_for(name: str) -> str:
+        return ".jpg" if name in JPEG_EMBED_REGIONS else ".png"
+
+    def encode(job) -> str:
+        (_, ext), arr = job
+        return _data_uri(image_to_base64(arr, ext), ext)
+
+    # 埋め込みが必要な画像だけを、同じ配列を二重にエンコードしないよう
+    # (id, 形式) で重複を除き、スレッドで並列に変換
+    jobs = {(id(roi), ext_for(name)): roi for name, roi in regions.items()
+            if name not in linked_paths}
+    if thumbnail_src is None:
+        jobs[(id(thumbnail), ".jpg")] = thumbnail
+    if not full_page_linked:
+        # 「クリックで拡大」で開く原寸画像も埋め込む
+        jobs[(id(full_page_image), ".jpg")] = full_page_image
+    encoded = {}
+    if jobs:
+        with ThreadPoolExecutor(max_workers=IMAGE_IO_WORKERS) as executor:
+            encoded = dict(zip(jobs, executor.map(encode, jobs.items())))
+
+    # 各切り出し画像・全体画像のsrc（保存済みのものはHTMLからの相対パスで参照）
+    image_srcs = {
+        name: (versioned(linked_paths[name]) if name in linked_paths
+               else encoded[(id(roi), ext_for(name))])
+        for name, roi in regions.items()
+    }
+    full_page_src = thumbnail_src or encoded[(id(thumbnail), ".jpg")]
+    if full_page_linked:
+        full_page_href = versioned(full_page_path)
+    else:
+        full_page_href = encoded[(id(full_page_image), ".jpg")]
 
     # 質問2のバリデーション結果
     q2_validation = validation_results.get("質問2", {})
 
-    html = _build_html(image_data, ocr_results, full_page_b64,
-                       q2_validation, validation_results)
+    context = _build_context(image_srcs, ocr_results, full_page_src, full_page_href,
+                             q2_validation, validation_results)
 
-    # ファイル保存
-    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    # ファイル保存（HTML全体を文字列にせず、テンプレートの出力を順に書き出す）
+    os.makedirs(html_dir, exist_ok=True)
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+        _get_template().stream(**context).dump(f)
 
     print(f"  照合HTML: {output_path}")
     return output_path
 
 
-def _build_html(
-    image_data: Dict[str, str],
-    ocr_results: Dict[str, Any],
-    full_page_b64: str,
-    q2_validation: Dict[str, Any],
-    all_validations: Dict[str, Any],
-) -> str:
-    """HTML文字列を構築"""
-
-    # --- 質問2セクション用HTML ---
-    q2_warning_html = ""
-    if q2_validation.get("has_warning"):
-        severity_class = "warning" if q2_validation["severity"] == "warning" else "error"
-        q2_warning_html = f"""
-        <div class="validation-alert {severity_class}">
-            ⚠️ {q2_validation['message']}
-        </div>
-        """
-
-    # 質問2のOCRフィールドをテーブル行として生成
-    q2_fields_html = ""
-    q2_field_names = [
-        ("質問2_元号", "元号"),
-        ("質問2_年", "年"),
-        ("質問2_月", "月"),
-        ("質問2_日", "日"),
-        ("質問2_QRコード回答", "QRコードで回答"),
-    ]
-    for field_key, label in q2_field_names:
-        result = ocr_results.get(field_key, {})
-        value = result.get("value", "")
-        confidence = result.get("confidence", "low")
+# 信頼度 → 表示クラス
+CONFIDENCE_CLASSES = {
+    "high": "confirmed",
+    "medium": "needs-review",
+    "low": "needs-review",
+}
 
-        # 表示値の整形
-        if field_key == "質問2_QRコード回答":
-            display_value = "✓ チェックあり" if value else "☐ チェックなし"
-        else:
-            display_value = str(value) if value else "(空欄)"
+# 質問2のOCRフィールド（テーブル行として表示）
+Q2_FIELDS = [
+    ("質問2_元号", "元号"),
+    ("質問2_年", "年"),
+    ("質問2_月", "月"),
+    ("質問2_日", "日"),
+    ("質問2_QRコード回答", "QRコードで回答"),
+]
 
-        confidence_class = {
-            "high": "confirmed",
-            "medium": "needs-review",
-            "low": "needs-review",
-        }.get(confidence, "needs-review")
-
-        q2_fields_html += f"""
-            <tr class="{confidence_class}">
-                <td>{label}</td>
-                <td>
-                    <input type="text" class="ocr-value" data-field="{field_key}"
-                           value="{display_value}" />
-                </td>
-                <td>
-                    <span class="confidence-badge {confidence}">{confidence}</span>
-                </td>
-                <td>
-                    <button class="btn-ok" onclick="confirmField(this, '{field_key}')">OK</button>
-                    <button class="btn-edit" onclick="editField(this, '{field_key}')">編集</button>
-                </td>
-            </tr>
-        """
-
-    # --- 全体の質問セクション用HTML ---
-    sections_html = ""
-    processed_q2 = False
+# 質問2専用セクションの挿入位置を表す印
+Q2_SECTION = None
+
+
+def _section_layout() -> List[Optional[Tuple[str, str]]]:
+    """
+    照合画面のセクション並びを RELATIVE_REGIONS から求める（import時に1回だけ）
 
+    通常の質問は (name, description)、質問2は最初の「質問2_」の位置に Q2_SECTION を置く。
+    """
+    layout = []
+    processed_q2 = False
     for name, region_config in RELATIVE_REGIONS.items():
         # review_only フラグが立っているものはスキップ（質問2_行全体はQ2セクション内で表示）
         if region_config.get("review_only"):
@@ -388,374 +669,106 @@ def _build_html(
         if name.startswith("質問2_"):
             if not processed_q2:
                 processed_q2 = True
-                q2_row_b64 = image_data.get("質問2_行全体", "")
-                sections_html += f"""
-                <div class="section" id="section-q2">
-                    <h3>質問2: 生年月日 + QRコード回答</h3>
-                    {q2_warning_html}
-                    <div class="review-image-container">
-                        <img src="data:image/png;base64,{q2_row_b64}"
-                             alt="質問2行全体" class="review-image-full-row" />
-                    </div>
-                    <table class="ocr-result-table">
-                        <thead>
-                            <tr>
-                                <th>項目</th>
-                                <th>OCR結果</th>
-                                <th>信頼度</th>
-                                <th>操作</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {q2_fields_html}
-                        </tbody>
-                    </table>
-                </div>
-                """
+                layout.append(Q2_SECTION)
+            continue
+
+        layout.append((name, region_config.get("description", name)))
+    return layout
+
+
+SECTION_LAYOUT = _section_layout()
+
+# 照合画面に画像を表示する領域（質問2の各フィールドは行全体画像でまとめて表示）
+DISPLAYED_REGIONS = frozenset(
+    [meta[0] for meta in SECTION_LAYOUT if meta is not Q2_SECTION] + [Q2_ROW_REGION]
+)
+
+
+def _build_context(
+    image_srcs: Dict[str, str],
+    ocr_results: Dict[str, OcrResult],
+    full_page_src: str,
+    full_page_href: str,
+    q2_validation: Dict[str, Any],
+    all_validations: Dict[str, Any],
+) -> Dict[str, Any]:
+    """templates/verification.html に渡す描画データを構築"""
+
+    # --- 質問2セクション用データ ---
+    q2_fields = []
+    for field_key, label in Q2_FIELDS:
+        result = ocr_results.get(field_key, EMPTY_RESULT)
+        value = result.value
+        confidence = result.confidence
+
+        # 表示値の整形
+        if field_key == "質問2_QRコード回答":
+            display_value = "✓ チェックあり" if value else "☐ チェックなし"
+        else:
+            display_value = str(value) if value else "(空欄)"
+
+        q2_fields.append({
+            "key": field_key,
+            "label": label,
+            "value": display_value,
+            "confidence": confidence,
+            "confidence_class": CONFIDENCE_CLASSES.get(confidence, "needs-review"),
+        })
+
+    q2 = {
+        "warning": q2_validation["message"] if q2_validation.get("has_warning") else None,
+        "severity_class": "warning" if q2_validation.get("severity") == "warning" else "error",
+        "row_src": image_srcs.get(Q2_ROW_REGION, ""),
+        "fields": q2_fields,
+    }
+
+    # --- 全体の質問セクション用データ ---
+    sections = []
+
+    for meta in SECTION_LAYOUT:
+        if meta is Q2_SECTION:
+            sections.append({"q2": True})
             continue
 
         # 通常の質問セクション
-        b64 = image_data.get(name, "")
-        result = ocr_results.get(name, {})
-        value = result.get("value", "")
-        confidence = result.get("confidence", "low")
-        description = region_config.get("description", name)
-
-        confidence_class = {
-            "high": "confirmed",
-            "medium": "needs-review",
-            "low": "needs-review",
-        }.get(confidence, "needs-review")
-
-        sections_html += f"""
-        <div class="section {confidence_class}" id="section-{name}">
-            <h3>{description}</h3>
-            <div class="field-row">
-                <div class="field-image">
-                    <img src="data:image/png;base64,{b64}" alt="{name}" />
-                </div>
-                <div class="field-result">
-                    <input type="text" class="ocr-value" data-field="{name}"
-                           value="{value if value else ''}" />
-                    <span class="confidence-badge {confidence}">{confidence}</span>
-                    <button class="btn-ok" onclick="confirmField(this, '{name}')">OK</button>
-                    <button class="btn-edit" onclick="editField(this, '{name}')">編集</button>
-                </div>
-            </div>
-        </div>
-        """
-
-    return f"""<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>糖化アンケート照合画面 v2.1</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: 'Segoe UI', 'Hiragino Sans', sans-serif;
-            background: #f5f5f5;
-            padding: 20px;
-        }}
-        .header {{
-            background: #1a73e8;
-            color: white;
-            padding: 16px 24px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-        .header h1 {{ font-size: 20px; }}
-        .header .version {{ font-size: 12px; opacity: 0.8; }}
-
-        /* 全体画像サムネイル */
-        .full-page-thumb {{
-            max-width: 200px;
-            cursor: pointer;
-            border: 2px solid #ddd;
-            border-radius: 4px;
-        }}
-        .full-page-thumb:hover {{ border-color: #1a73e8; }}
-
-        /* セクション共通 */
-        .section {{
-            background: white;
-            border-radius: 8px;
-            padding: 16px;
-            margin-bottom: 12px;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            border-left: 4px solid #ddd;
-        }}
-        .section.confirmed {{ border-left-color: #34a853; }}
-        .section.needs-review {{ border-left-color: #ea4335; }}
-        .section h3 {{
-            font-size: 14px;
-            margin-bottom: 10px;
-            color: #333;
-        }}
-
-        /* 質問2専用: 行全体画像 */
-        .review-image-container {{
-            background: #fafafa;
-            border: 1px solid #e0e0e0;
-            border-radius: 4px;
-            padding: 8px;
-            margin-bottom: 12px;
-            overflow-x: auto;
-        }}
-        .review-image-full-row {{
-            max-width: 100%;
-            height: auto;
-            display: block;
-        }}
-
-        /* バリデーション警告 */
-        .validation-alert {{
-            padding: 10px 14px;
-            border-radius: 6px;
-            margin-bottom: 12px;
-            font-size: 13px;
-            font-weight: 500;
-        }}
-        .validation-alert.warning {{
-            background: #fff3cd;
-            border: 1px solid #ffc107;
-            color: #856404;
-        }}
-        .validation-alert.error {{
-            background: #f8d7da;
-            border: 1px solid #dc3545;
-            color: #721c24;
-        }}
-
-        /* OCR結果テーブル */
-        .ocr-result-table {{
-            width: 100%;
-            border-collapse: collapse;
-            font-size: 13px;
-        }}
-        .ocr-result-table th {{
-            background: #f8f9fa;
-            padding: 8px 10px;
-            text-align: left;
-            border-bottom: 2px solid #dee2e6;
-            font-weight: 600;
-        }}
-        .ocr-result-table td {{
-            padding: 8px 10px;
-            border-bottom: 1px solid #eee;
-            vertical-align: middle;
-        }}
-        .ocr-result-table tr.confirmed {{ background: #f0fff0; }}
-        .ocr-result-table tr.needs-review {{ background: #fff8f0; }}
-
-        /* フィールド行（通常質問用） */
-        .field-row {{
-            display: flex;
-            gap: 16px;
-            align-items: center;
-        }}
-        .field-image {{
-            flex: 0 0 auto;
-            max-width: 400px;
-        }}
-        .field-image img {{
-            max-width: 100%;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-        }}
-        .field-result {{
-            flex: 1;
-            display: flex;
-            gap: 8px;
-            align-items: center;
-            flex-wrap: wrap;
-        }}
-
-        /* 入力フィールド */
-        .ocr-value {{
-            padding: 6px 10px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            font-size: 14px;
-            min-width: 120px;
-        }}
-        .ocr-value:focus {{
-            border-color: #1a73e8;
-            outline: none;
-            box-shadow: 0 0 0 2px rgba(26,115,232,0.2);
-        }}
-
-        /* 信頼度バッジ */
-        .confidence-badge {{
-            padding: 2px 8px;
-            border-radius: 10px;
-            font-size: 11px;
-            font-weight: 600;
-        }}
-        .confidence-badge.high {{ background: #d4edda; color: #155724; }}
-        .confidence-badge.medium {{ background: #fff3cd; color: #856404; }}
-        .confidence-badge.low {{ background: #f8d7da; color: #721c24; }}
-
-        /* ボタン */
-        .btn-ok {{
-            background: #34a853;
-            color: white;
-            border: none;
-            padding: 6px 14px;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 12px;
-        }}
-        .btn-ok:hover {{ background: #2d8f47; }}
-        .btn-edit {{
-            background: #fbbc04;
-            color: #333;
-            border: none;
-            padding: 6px 14px;
-            border-radius: 4px;
-            cursor: pointer;
-            font-size: 12px;
-        }}
-        .btn-edit:hover {{ background: #e5a800; }}
-
-        /* フッター操作バー */
-        .footer-bar {{
-            position: sticky;
-            bottom: 0;
-            background: white;
-            padding: 12px 20px;
-            box-shadow: 0 -2px 8px rgba(0,0,0,0.1);
-            border-radius: 8px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-top: 20px;
-        }}
-        .btn-save {{
-            background: #1a73e8;
-            color: white;
-            border: none;
-            padding: 10px 24px;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: 600;
-        }}
-        .btn-save:hover {{ background: #155ab6; }}
-
-        .progress-info {{
-            font-size: 13px;
-            color: #666;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div>
-            <h1>糖化アンケート照合画面</h1>
-            <span class="version">v2.1 - QRコード回答チェック対応</span>
-        </div>
-        <img src="data:image/png;base64,{full_page_b64}"
-             class="full-page-thumb" alt="全体画像"
-             onclick="window.open(this.src)" title="クリックで拡大" />
-    </div>
-
-    {sections_html}
-
-    <div class="footer-bar">
-        <div class="progress-info">
-            確認済: <span id="confirmed-count">0</span> /
-            <span id="total-count">0</span>
-        </div>
-        <div>
-            <button class="btn-save" onclick="saveResults()">
-                照合完了・保存
-            </button>
-        </div>
-    </div>
-
-    <script>
-        // 確認済フィールドの追跡
-        const confirmedFields = new Set();
-        const totalFields = document.querySelectorAll('.ocr-value').length;
-        document.getElementById('total-count').textContent = totalFields;
-
-        function confirmField(btn, fieldName) {{
-            const row = btn.closest('tr') || btn.closest('.section');
-            if (row) {{
-                row.classList.remove('needs-review');
-                row.classList.add('confirmed');
-            }}
-            confirmedFields.add(fieldName);
-            updateProgress();
-        }}
-
-        function editField(btn, fieldName) {{
-            const row = btn.closest('tr') || btn.closest('.section');
-            const input = row ? row.querySelector('.ocr-value') : null;
-            if (input) {{
-                input.focus();
-                input.select();
-            }}
-            confirmedFields.delete(fieldName);
-            if (row) {{
-                row.classList.remove('confirmed');
-                row.classList.add('needs-review');
-            }}
-            updateProgress();
-        }}
-
-        function updateProgress() {{
-            document.getElementById('confirmed-count').textContent = confirmedFields.size;
-        }}
-
-        // Shift+OK で範囲一括確定
-        document.addEventListener('click', function(e) {{
-            if (e.shiftKey && e.target.classList.contains('btn-ok')) {{
-                const allOkButtons = document.querySelectorAll('.btn-ok');
-                const clickedIndex = Array.from(allOkButtons).indexOf(e.target);
-                allOkButtons.forEach((btn, index) => {{
-                    if (index <= clickedIndex) {{
-                        const fieldName = btn.getAttribute('onclick')
-                            .match(/'([^']+)'/)?.[1];
-                        if (fieldName) confirmField(btn, fieldName);
-                    }}
-                }});
-            }}
-        }});
-
-        function saveResults() {{
-            const results = {{}};
-            document.querySelectorAll('.ocr-value').forEach(input => {{
-                results[input.dataset.field] = {{
-                    value: input.value,
-                    confirmed: confirmedFields.has(input.dataset.field)
-                }};
-            }});
-
-            // JSONダウンロード
-            const blob = new Blob([JSON.stringify(results, null, 2)],
-                                  {{ type: 'application/json' }});
-            const url = URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = 'survey_result.json';
-            a.click();
-            URL.revokeObjectURL(url);
-        }}
-    </script>
-</body>
-</html>"""
+        name, description = meta
+        result = ocr_results.get(name, EMPTY_RESULT)
+        value = result.value
+        confidence = result.confidence
+
+        sections.append({
+            "q2": False,
+            "name": name,
+            "description": description,
+            "img_src": image_srcs.get(name, ""),
+            "value": value if value else "",
+            "confidence": confidence,
+            "confidence_class": CONFIDENCE_CLASSES.get(confidence, "needs-review"),
+        })
+
+    return {
+        "sections": sections,
+        "q2": q2,
+        "full_page_src": full_page_src,
+        "full_page_href": full_page_href,
+    }
 
 
 # ============================================
 # メイン処理フロー
 # ============================================
 
+def _write_succeeded(path: str, future) -> bool:
+    """write_image の結果を確認し、失敗していれば警告を出す"""
+    try:
+        if future.result():
+            return True
+        print(f"  Warning: 画像を保存できませんでした: {path}")
+    except Exception as e:
+        print(f"  Warning: 画像の保存でエラー: {path}: {e}")
+    return False
+
+
 def process_survey(file_path: str) -> Dict[str, Any]:
     """
     アンケート処理メインフロー
@@ -788,80 +801,88 @@ def process_survey(file_path: str) -> Dict[str, Any]:
     print("  [2/6] 傾斜補正...")
     corrected = correct_skew(image)
 
-    # 全体画像を保存
-    full_page_path = os.path.join(PATHS["cropped_images"], "full_page.png")
-    os.makedirs(PATHS["cropped_images"], exist_ok=True)
-    cv2.imwrite(full_page_path, corrected)
-
-    # 3. 全領域切り出し
-    print("  [3/6] 領域切り出し...")
-    regions = extract_all_regions(corrected)
-
-    # 切り出し画像を保存
-    for name, roi in regions.items():
-        safe_name = name.replace("/", "_").replace("\\", "_")
-        path = os.path.join(PATHS["cropped_images"], f"{safe_name}.png")
-        cv2.imwrite(path, roi)
-    print(f"  切り出し完了: {len(regions)} 領域")
-
-    # 4. OCR/チェックボックス検出
-    print("  [4/6] OCR・チェックボックス検出...")
-    ocr_results = {}
-
-    for name, region_config in RELATIVE_REGIONS.items():
-        if region_config.get("review_only"):
-            continue
-
-        roi = regions.get(name)
-        if roi is None:
-            ocr_results[name] = {"value": None, "confidence": "low"}
-            continue
-
-        field_type = region_config.get("type", "")
-
-        if field_type == "checkbox_single" and name == "質問2_QRコード回答":
-            # v2.1: QRコード回答チェックボックス
-            checked = detect_checkbox(roi, threshold=0.20)
-            ocr_results[name] = {
-                "value": checked,
-                "confidence": "medium",
-                "raw_type": "checkbox",
-            }
-            print(f"    {name}: {'チェックあり' if checked else 'チェックなし'}")
-
-        elif field_type == "filled_box":
-            options = region_config.get("options", [])
-            selected = detect_filled_box(roi, options)
-            ocr_results[name] = {
-                "value": selected,
-                "confidence": "medium" if selected else "low",
-            }
-
-        elif field_type in ("checkbox_single",):
-            options = region_config.get("options", [])
-            selected = detect_filled_box(roi, options)
-            ocr_results[name] = {
-                "value": selected,
-                "confidence": "medium" if selected else "low",
-            }
-
-        else:
-            # 手書き文字・数値はClaude API or 手動
-            ocr_results[name] = {
-                "value": None,
-                "confidence": "low",
-                "note": "Claude APIまたは手動入力が必要"
-            }
-
-    # 5. バリデーション
-    print("  [5/6] バリデーション...")
-    validation_results = {}
-
-    # 質問2の矛盾検出
-    q2_validation = validate_q2_consistency(ocr_results)
-    validation_results["質問2"] = q2_validation
-    if q2_validation.get("has_warning"):
-        print(f"    ⚠️ {q2_validation['message']}")
+    # 全体画像・切り出し画像の書き出しはバックグラウンドのスレッドで進め、
+    # 照合HTML生成の前に結果を確認する
+    crop_dir = PATHS["cropped_images"]
+    os.makedirs(crop_dir, exist_ok=True)
+    full_page_path = os.path.join(crop_dir, "full_page.png")
+
+    with ThreadPoolExecutor(max_workers=IMAGE_IO_WORKERS) as writer:
+        full_page_write = writer.submit(write_image, full_page_path, corrected)
+
+        # 3. 全領域切り出し
+        print("  [3/6] 領域切り出し...")
+        page = preprocess_page(corrected)
+        regions = extract_all_regions(page.bgr)
+        # チェックボックス検出用（二値化済みページのビュー）
+        binary_regions = extract_all_regions(page.binary)
+
+        # 切り出し画像を保存（照合HTMLからはこのパスを参照する）
+        region_paths = {name: os.path.join(crop_dir, REGION_FILENAMES[name]) for name in regions}
+        region_writes = {
+            name: writer.submit(write_image, region_paths[name], roi)
+            for name, roi in regions.items()
+        }
+        print(f"  切り出し完了: {len(regions)} 領域")
+
+        # 4. OCR/チェックボックス検出
+        print("  [4/6] OCR・チェックボックス検出...")
+        # 手書き文字・数値はClaude API or 手動（切り出せなかった領域は結果なし）
+        ocr_results = {
+            name: MANUAL_RESULT if name in binary_regions else OcrResult()
+            for name in MANUAL_REGIONS
+        }
+        # 黒塗りチェックボックスは (形状, 選択肢) が同じ領域をまとめて判定する
+        filled_groups = {}
+
+        for name, region_config in DETECT_REGIONS.items():
+            roi = binary_regions.get(name)
+            if roi is None:
+                ocr_results[name] = OcrResult()
+                continue
+
+            threshold = SINGLE_CHECKBOX_THRESHOLDS.get(name)
+            if threshold is not None:
+                checked = detect_checkbox(roi, threshold=threshold)
+                ocr_results[name] = OcrResult(
+                    value=checked,
+                    confidence="medium",
+                    raw_type="checkbox",
+                )
+                print(f"    {name}: {'チェックあり' if checked else 'チェックなし'}")
+            else:
+                # checkbox_single（性別など）も filled_box も選択肢ごとの黒塗りで判定
+                options = tuple(region_config.get("options", []))
+                filled_groups.setdefault((roi.shape, options), []).append(name)
+
+        for (_, options), names in filled_groups.items():
+            rois = np.stack([binary_regions[name] for name in names])
+            for name, selected in zip(names, detect_filled_boxes(rois, list(options))):
+                ocr_results[name] = OcrResult(
+                    value=selected,
+                    confidence="medium" if selected else "low",
+                )
+
+        # 出力順を RELATIVE_REGIONS の並びに戻す
+        ocr_results = {name: ocr_results[name] for name in RELATIVE_REGIONS if name in ocr_results}
+
+        # 5. バリデーション
+        print("  [5/6] バリデーション...")
+        validation_results = {}
+
+        # 質問2の矛盾検出
+        q2_validation = validate_q2_consistency(ocr_results)
+        validation_results["質問2"] = q2_validation
+        if q2_validation.get("has_warning"):
+            print(f"    ⚠️ {q2_validation['message']}")
+
+    # 書き出しに失敗した画像は照合HTMLに埋め込む
+    if not _write_succeeded(full_page_path, full_page_write):
+        full_page_path = None
+    region_paths = {
+        name: path for name, path in region_paths.items()
+        if _write_succeeded(path, region_writes[name])
+    }
 
     # 6. 照合HTML生成
     print("  [6/6] 照合HTML生成...")
@@ -871,11 +892,13 @@ def process_survey(file_path: str) -> Dict[str, Any]:
         full_page_image=corrected,
         validation_results=validation_results,
         output_path=PATHS["output_html"],
+        region_paths=region_paths,
+        full_page_path=full_page_path,
     )
 
     # JSON保存
     output = {
-        "ocr_results": {k: v for k, v in ocr_results.items()},
+        "ocr_results": {k: v.to_dict() for k, v in ocr_results.items()},
         "validation": validation_results,
         "source_file": os.path.basename(file_path),
     }